@@ -0,0 +1,211 @@
+"""
+Times the bot's hot-path queries before and after HOT_PATH_INDEXES.
+
+Seeds a scratch schema on a local Postgres, runs each query against the bare
+tables, builds the indexes exactly as main.py defines them, and runs the
+queries again. The scratch schema is dropped afterwards.
+
+    BENCH_DATABASE_URL=postgresql://localhost/postgres python bench_indexes.py
+"""
+
+import ast
+import asyncio
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import asyncpg
+
+SCHEMA = "bench_indexes"
+RUNS = int(os.getenv("BENCH_RUNS", "50"))
+USERS = int(os.getenv("BENCH_USERS", "100000"))
+GIVEAWAYS = int(os.getenv("BENCH_GIVEAWAYS", "2000"))
+ENTRIES_PER_GIVEAWAY = int(os.getenv("BENCH_ENTRIES_PER_GIVEAWAY", "250"))
+NOW = 1_700_000_000
+
+TABLES = """
+CREATE TABLE giveaways (
+    id SERIAL PRIMARY KEY,
+    ends_at BIGINT NOT NULL,
+    ended BOOLEAN NOT NULL DEFAULT FALSE,
+    announced BOOLEAN NOT NULL DEFAULT TRUE
+);
+CREATE TABLE giveaway_entries (
+    giveaway_id INT REFERENCES giveaways(id) ON DELETE CASCADE,
+    user_id BIGINT,
+    entries_spent BIGINT NOT NULL,
+    PRIMARY KEY (giveaway_id, user_id)
+);
+CREATE TABLE tickets (
+    channel_id BIGINT PRIMARY KEY,
+    opener_id BIGINT NOT NULL,
+    open BOOLEAN NOT NULL DEFAULT TRUE
+);
+CREATE TABLE invite_codes (
+    code TEXT PRIMARY KEY,
+    creator_id BIGINT NOT NULL,
+    invite_id TEXT NOT NULL,
+    created_at BIGINT NOT NULL,
+    expires_at BIGINT NOT NULL,
+    valid_uses INT NOT NULL DEFAULT 0,
+    invalid_uses INT NOT NULL DEFAULT 0
+);
+CREATE TABLE invite_joins (
+    invited_id BIGINT PRIMARY KEY,
+    inviter_id BIGINT NOT NULL,
+    joined_at BIGINT NOT NULL,
+    valid BOOLEAN NOT NULL
+);
+CREATE TABLE payout_items (
+    payout_date DATE NOT NULL,
+    user_id BIGINT NOT NULL,
+    paid BOOLEAN NOT NULL DEFAULT FALSE,
+    PRIMARY KEY (payout_date, user_id)
+);
+"""
+
+SEED = """
+INSERT INTO giveaways (ends_at, ended, announced)
+SELECT {now} - 86400 + g * 60, g < {giveaways} - 20, true
+FROM generate_series(1, {giveaways}) AS g;
+
+INSERT INTO giveaway_entries (giveaway_id, user_id, entries_spent)
+SELECT g, u, 1 + (random() * 500)::int
+FROM generate_series(1, {giveaways}) AS g, generate_series(1, {entries}) AS u;
+
+INSERT INTO tickets (channel_id, opener_id, open)
+SELECT c, (random() * {users})::bigint, random() < 0.02
+FROM generate_series(1, {users}) AS c;
+
+INSERT INTO invite_codes (code, creator_id, invite_id, created_at, expires_at)
+SELECT 'c' || i, (random() * {users})::bigint, 'i' || i,
+       {now} - (random() * 2592000)::bigint, {now} - 86400 + (random() * 172800)::bigint
+FROM generate_series(1, {users}) AS i;
+
+INSERT INTO invite_joins (invited_id, inviter_id, joined_at, valid)
+SELECT j, (random() * {users} / 10)::bigint, {now} - (random() * 2592000)::bigint, random() < 0.8
+FROM generate_series(1, {users}) AS j;
+
+INSERT INTO payout_items (payout_date, user_id, paid)
+SELECT d::date, u, d::date < CURRENT_DATE
+FROM generate_series(CURRENT_DATE - 30, CURRENT_DATE, interval '1 day') AS d,
+     generate_series(1, {users} / 20) AS u;
+"""
+
+QUERIES: List[Tuple[str, str, tuple]] = [
+    (
+        "giveaways due",
+        "SELECT id, ends_at FROM giveaways WHERE ended=false OR announced=false",
+        (),
+    ),
+    (
+        "entrants page",
+        """
+        SELECT user_id, entries_spent FROM giveaway_entries
+        WHERE giveaway_id=$1 ORDER BY entries_spent DESC, user_id LIMIT 20 OFFSET 40
+        """,
+        (GIVEAWAYS // 2,),
+    ),
+    (
+        "open tickets by opener",
+        "SELECT COUNT(*) FROM tickets WHERE opener_id=$1 AND open=true",
+        (USERS // 3,),
+    ),
+    (
+        "active invite codes",
+        "SELECT * FROM invite_codes WHERE creator_id=$1 AND expires_at > $2 ORDER BY created_at DESC",
+        (USERS // 3, NOW),
+    ),
+    (
+        "invite code by invite_id",
+        "SELECT * FROM invite_codes WHERE invite_id=$1",
+        (f"i{USERS // 2}",),
+    ),
+    (
+        "invite stats since reset",
+        "SELECT SUM(valid_uses), SUM(invalid_uses) FROM invite_codes WHERE created_at >= $1",
+        (NOW - 3600,),
+    ),
+    (
+        "valid invites since reset",
+        """
+        SELECT COUNT(*) AS valid_count
+        FROM invite_joins
+        WHERE inviter_id=$1 AND joined_at >= $2 AND valid=true
+        """,
+        (USERS // 30, NOW - 604800),
+    ),
+    (
+        "unpaid payout chunk",
+        """
+        SELECT user_id FROM payout_items
+        WHERE payout_date=CURRENT_DATE AND paid=false ORDER BY user_id LIMIT 1000
+        """,
+        (),
+    ),
+]
+
+
+def load_hot_path_indexes() -> List[Tuple[str, str]]:
+    source = (Path(__file__).resolve().parent / "main.py").read_text()
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(target, ast.Name) and target.id == "HOT_PATH_INDEXES" for target in node.targets
+        ):
+            return ast.literal_eval(node.value)
+    raise RuntimeError("HOT_PATH_INDEXES not found in main.py")
+
+
+async def time_queries(conn: asyncpg.Connection) -> List[Tuple[float, str]]:
+    results = []
+    for _, sql, args in QUERIES:
+        await conn.fetch(sql, *args)
+        samples = []
+        for _ in range(RUNS):
+            started = time.perf_counter()
+            await conn.fetch(sql, *args)
+            samples.append((time.perf_counter() - started) * 1000)
+        plan = json.loads(await conn.fetchval(f"EXPLAIN (FORMAT JSON) {sql}", *args))
+        results.append((statistics.median(samples), leaf_node(plan[0]["Plan"])))
+    return results
+
+
+def leaf_node(node: dict) -> str:
+    while node.get("Plans"):
+        node = node["Plans"][0]
+    return node["Node Type"]
+
+
+async def main():
+    dsn = os.getenv("BENCH_DATABASE_URL") or os.getenv("DATABASE_URL")
+    conn = await asyncpg.connect(dsn=dsn)
+    try:
+        await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        await conn.execute(f"CREATE SCHEMA {SCHEMA}")
+        await conn.execute(f"SET search_path TO {SCHEMA}")
+        await conn.execute(TABLES)
+        print("Seeding...")
+        await conn.execute(
+            SEED.format(now=NOW, users=USERS, giveaways=GIVEAWAYS, entries=ENTRIES_PER_GIVEAWAY)
+        )
+        await conn.execute("ANALYZE")
+        before = await time_queries(conn)
+        for name, definition in load_hot_path_indexes():
+            await conn.execute(f"CREATE INDEX CONCURRENTLY {name} ON {definition}")
+        await conn.execute("ANALYZE")
+        after = await time_queries(conn)
+    finally:
+        await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        await conn.close()
+
+    print(f"{'query':<28}{'before ms':>11}{'after ms':>10}{'speedup':>9}  plan")
+    for (label, _, _), (old_ms, old_plan), (new_ms, new_plan) in zip(QUERIES, before, after):
+        speedup = old_ms / new_ms if new_ms else float("inf")
+        print(f"{label:<28}{old_ms:>11.3f}{new_ms:>10.3f}{speedup:>8.1f}x  {old_plan} -> {new_plan}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,123 @@
+"""
+Checks that unit_of_work call sites never hold a pooled connection while
+talking to Discord.
+
+Loads main.py without starting the bot, migrates a scratch schema on a local
+Postgres, and fires concurrent dice rolls through DiceRollModal.on_submit with
+a deliberately slow interaction.response.send_message on a small pool. If a
+reply were sent inside the transaction, callers would queue for a connection
+for roughly the send delay; instead pool waits must stay well below it. The
+scratch schema is dropped afterwards.
+
+    BENCH_DATABASE_URL=postgresql://localhost/postgres python bench_unit_of_work.py
+"""
+
+import ast
+import asyncio
+import os
+import time
+import types
+from pathlib import Path
+
+import asyncpg
+
+SCHEMA = "bench_unit_of_work"
+POOL_SIZE = int(os.getenv("BENCH_POOL_SIZE", "2"))
+INTERACTIONS = int(os.getenv("BENCH_INTERACTIONS", "20"))
+SEND_DELAY_MS = int(os.getenv("BENCH_SEND_DELAY_MS", "500"))
+USERS = 50
+
+
+def load_main() -> types.ModuleType:
+    os.environ.setdefault("TOKEN", "bench")
+    os.environ["DB_POOL_MIN_SIZE"] = str(POOL_SIZE)
+    os.environ["DB_POOL_MAX_SIZE"] = str(POOL_SIZE)
+    path = Path(__file__).resolve().parent / "main.py"
+    tree = ast.parse(path.read_text())
+    tree.body = [
+        node
+        for node in tree.body
+        if not (
+            isinstance(node, ast.Expr)
+            and isinstance(node.value, ast.Call)
+            and ast.unparse(node.value.func) == "bot.run"
+        )
+    ]
+    module = types.ModuleType("main")
+    module.__file__ = str(path)
+    exec(compile(tree, str(path), "exec"), module.__dict__)
+    return module
+
+
+def fake_interaction(interaction_id: int, user_id: int) -> types.SimpleNamespace:
+    async def send_message(*args, **kwargs):
+        await asyncio.sleep(SEND_DELAY_MS / 1000)
+
+    return types.SimpleNamespace(
+        id=interaction_id,
+        user=types.SimpleNamespace(id=user_id, mention=f"<@{user_id}>"),
+        channel_id=1,
+        response=types.SimpleNamespace(send_message=send_message),
+    )
+
+
+async def roll(main: types.ModuleType, interaction_id: int):
+    modal = main.DiceRollModal()
+    modal.entries_amount._value = "10"
+    await modal.on_submit(fake_interaction(interaction_id, interaction_id % USERS + 1))
+
+
+async def main():
+    dsn = os.getenv("BENCH_DATABASE_URL") or os.getenv("DATABASE_URL")
+    bot_main = load_main()
+    conn = await asyncpg.connect(dsn=dsn)
+    try:
+        await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        await conn.execute(f"CREATE SCHEMA {SCHEMA}")
+        db = bot_main.db_pool
+        db.pool = await asyncpg.create_pool(
+            dsn=dsn,
+            min_size=POOL_SIZE,
+            max_size=POOL_SIZE,
+            connection_class=bot_main.HotConnection,
+            server_settings={"search_path": SCHEMA},
+        )
+        try:
+            await bot_main.run_migrations()
+            async with db.acquire() as setup:
+                await bot_main.ensure_ledger_partitions(setup)
+                await setup.execute(
+                    "INSERT INTO users (user_id, entries) SELECT u, 1000000 FROM generate_series(1, $1) AS u",
+                    USERS,
+                )
+            db.metrics.update(checkouts=0, waited=0, wait_ms_total=0.0, wait_ms_max=0.0, peak_in_use=0)
+            started = time.perf_counter()
+            await asyncio.gather(*(roll(bot_main, i) for i in range(INTERACTIONS)))
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            metrics = dict(db.metrics)
+            in_use = db.in_use
+        finally:
+            await db.close()
+    finally:
+        await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        await conn.close()
+
+    print(f"{INTERACTIONS} interactions, pool {POOL_SIZE}, send delay {SEND_DELAY_MS} ms")
+    print(f"elapsed          {elapsed_ms:>10.1f} ms")
+    print(f"checkouts        {metrics['checkouts']:>10}")
+    print(f"waited           {metrics['waited']:>10}")
+    print(f"wait ms avg      {metrics['wait_ms_total'] / max(metrics['checkouts'], 1):>10.3f}")
+    print(f"wait ms max      {metrics['wait_ms_max']:>10.3f}")
+    print(f"peak in use      {metrics['peak_in_use']:>10}")
+
+    assert in_use == 0, f"{in_use} connections still checked out"
+    assert metrics["checkouts"] >= INTERACTIONS, "unit_of_work did not go through db_pool.acquire()"
+    assert metrics["wait_ms_max"] < SEND_DELAY_MS, (
+        f"a caller waited {metrics['wait_ms_max']:.1f} ms for a connection; "
+        "a Discord reply is being sent while a connection is held"
+    )
+    print("ok")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,19 +1,31 @@
 import asyncio
+import contextlib
 import hashlib
+import heapq
+import math
 import os
 import json
 import random
 import re
 import secrets
-from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional, Tuple
+import signal
+import time
+from bisect import bisect_right
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
 from zoneinfo import ZoneInfo
 
 import asyncpg
 import discord
 from discord.ext import commands
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 TOKEN = os.getenv("TOKEN")
 if not TOKEN:
     raise RuntimeError("Missing TOKEN environment variable")
@@ -122,6 +134,56 @@ RANKS = [
 
 RNG_COOLDOWN = 0
 GENERATOR_COOLDOWN_SECONDS = 15
+DICE_MAX_ROLLS = 1_000_000
+MEMBER_QUERY_CHUNK = 100
+MEMBER_QUERY_CONCURRENCY = int(os.getenv("MEMBER_QUERY_CONCURRENCY", "3"))
+MEMBER_NEGATIVE_TTL_SECONDS = int(os.getenv("MEMBER_NEGATIVE_TTL_SECONDS", "600"))
+MEMBER_RESOLVER_MAX_MISSING = 50_000
+GIVEAWAY_END_CONCURRENCY = int(os.getenv("GIVEAWAY_END_CONCURRENCY", "4"))
+GIVEAWAY_RECONCILE_SECONDS = int(os.getenv("GIVEAWAY_RECONCILE_SECONDS", "600"))
+GIVEAWAY_ANNOUNCE_LEASE_SECONDS = 120
+MIGRATION_LOCK_KEY = 0x41584F4C
+MESSAGE_UPDATE_INTERVAL_SECONDS = int(os.getenv("MESSAGE_UPDATE_INTERVAL_SECONDS", "10"))
+ENTRANTS_PAGE_SIZE = 20
+ENTRANTS_CACHE_TTL_SECONDS = 60
+GIVEAWAY_DRAW_MODE = os.getenv("GIVEAWAY_DRAW_MODE", "local").lower()
+AUTOMOD_FLUSH_INTERVAL_MS = int(os.getenv("AUTOMOD_FLUSH_INTERVAL_MS", "500"))
+AUTOMOD_CACHE_MAX_USERS = int(os.getenv("AUTOMOD_CACHE_MAX_USERS", "50000"))
+INGEST_WINDOW_MS = int(os.getenv("INGEST_WINDOW_MS", "250"))
+INGEST_QUEUE_MAX = int(os.getenv("INGEST_QUEUE_MAX", "5000"))
+ROLE_SYNC_INTERVAL_MS = int(os.getenv("ROLE_SYNC_INTERVAL_MS", "250"))
+RANK_DEBOUNCE_MS = int(os.getenv("RANK_DEBOUNCE_MS", "2000"))
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "2"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "1024"))
+DB_MAX_INACTIVE_LIFETIME = float(os.getenv("DB_MAX_INACTIVE_LIFETIME", "300"))
+DB_COMMAND_TIMEOUT = float(os.getenv("DB_COMMAND_TIMEOUT", "30"))
+BALANCE_CACHE_MAX_USERS = int(os.getenv("BALANCE_CACHE_MAX_USERS", "50000"))
+LEDGER_PARTITIONS_AHEAD = 2
+LEDGER_SNAPSHOT_INTERVAL_SECONDS = int(os.getenv("LEDGER_SNAPSHOT_INTERVAL_SECONDS", "3600"))
+LEDGER_SNAPSHOT_LAG_SECONDS = 300
+LEDGER_MISMATCH_LOG_LIMIT = 25
+DAILY_PAYOUT_MIN_MESSAGES = 50
+DAILY_BOOSTER_REWARD = 15
+PAYOUT_CHUNK_SIZE = int(os.getenv("PAYOUT_CHUNK_SIZE", "1000"))
+PAYOUT_RETRY_BASE_SECONDS = 10
+PAYOUT_RETRY_MAX_SECONDS = 600
+LOG_QUEUE_MAX = int(os.getenv("LOG_QUEUE_MAX", "10000"))
+LOG_EMBED_QUEUE_MAX = int(os.getenv("LOG_EMBED_QUEUE_MAX", "1000"))
+LOG_FLUSH_INTERVAL_MS = int(os.getenv("LOG_FLUSH_INTERVAL_MS", "1000"))
+LOG_DIGEST_INTERVAL_SECONDS = int(os.getenv("LOG_DIGEST_INTERVAL_SECONDS", "30"))
+STAFF_LOG_RATE_LIMIT = 5
+STAFF_LOG_RATE_PERIOD = 5.0
+EMBEDS_PER_MESSAGE = 10
+EMBED_MESSAGE_CHAR_LIMIT = 6000
+PRIORITY_LOG_ACTIONS = {
+    "automod_punishment",
+    "automod_entry_ban",
+    "report_submitted",
+    "ingest_batch_dropped",
+    "ledger_partition_failed",
+}
+DIGEST_ENTRY_SOURCES = {"chat_rng"}
 
 timezone_berlin = ZoneInfo("Europe/Berlin")
 
@@ -189,7 +251,28 @@ intents.members = True
 intents.presences = True
 intents.message_content = True
 
-bot = commands.Bot(command_prefix="!", intents=intents)
+shutdown_hooks: List[Callable[[], Awaitable[None]]] = []
+
+
+class AxolotlBot(commands.Bot):
+    async def setup_hook(self):
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGTERM, lambda: asyncio.create_task(self.close()))
+        except (NotImplementedError, RuntimeError):
+            pass
+
+    async def close(self):
+        for hook in shutdown_hooks:
+            try:
+                await hook()
+            except Exception:
+                pass
+        await db_pool.close()
+        await super().close()
+
+
+bot = AxolotlBot(command_prefix="!", intents=intents)
 
 TIME_MULTIPLIERS = {
     "s": 1,
@@ -214,11 +297,169 @@ INVITE_STOCK_DEFAULTS = {
 }
 
 invite_cache: Dict[int, int] = {}
+entrants_cache: Dict[int, Dict[str, object]] = {}
 background_tasks: List[asyncio.Task] = []
 consecutive_message_tracker: Dict[int, Tuple[int, int]] = {}
 
 
-db_pool = None
+HOT_QUERIES = {
+    "ledger_credit": """
+        WITH credited AS (
+            INSERT INTO users (user_id, entries, daily_messages, last_daily_check)
+            VALUES ($1, $2, 0, 0)
+            ON CONFLICT (user_id) DO UPDATE SET entries = users.entries + EXCLUDED.entries
+            RETURNING entries
+        ), recorded AS (
+            INSERT INTO entries_ledger (user_id, delta, source, ref_id, ts)
+            SELECT $1, $2, $3, $4, $5 FROM credited
+        )
+        SELECT entries FROM credited
+    """,
+    "ledger_adjust": """
+        WITH adjusted AS (
+            UPDATE users
+            SET entries = entries + $2
+            WHERE user_id=$1 AND entries >= $3
+            RETURNING entries
+        ), recorded AS (
+            INSERT INTO entries_ledger (user_id, delta, source, ref_id, ts)
+            SELECT $1, $2, $4, $5, $6 FROM adjusted
+        )
+        SELECT entries FROM adjusted
+    """,
+    "user_entries": "SELECT entries FROM users WHERE user_id=$1",
+    "automod_state": """
+        SELECT last_msg_hash, last_msg_ts, streak_count, last_streak_ts, no_entry_until, rng_cooldown_until
+        FROM automod_state
+        WHERE user_id=$1
+    """,
+    "lock_open_giveaway": "SELECT NOT ended FROM giveaways WHERE id=$1 FOR NO KEY UPDATE",
+    "open_ticket_count": "SELECT COUNT(*) FROM tickets WHERE opener_id=$1 AND open=true",
+}
+
+
+class HotConnection(asyncpg.Connection):
+    """Pool connection that tracks balances changed in its current transaction."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pending_balances: Dict[int, int] = {}
+
+
+class Database:
+    def __init__(self):
+        self.pool: Optional[asyncpg.Pool] = None
+        self.in_use = 0
+        self.metrics = {
+            "checkouts": 0,
+            "waited": 0,
+            "wait_ms_total": 0.0,
+            "wait_ms_max": 0.0,
+            "peak_in_use": 0,
+        }
+
+    async def connect(self):
+        if self.pool:
+            return
+        self.pool = await asyncpg.create_pool(
+            dsn=os.getenv("DATABASE_URL"),
+            min_size=DB_POOL_MIN_SIZE,
+            max_size=DB_POOL_MAX_SIZE,
+            statement_cache_size=DB_STATEMENT_CACHE_SIZE,
+            max_inactive_connection_lifetime=DB_MAX_INACTIVE_LIFETIME,
+            command_timeout=DB_COMMAND_TIMEOUT,
+            connection_class=HotConnection,
+        )
+
+    async def close(self):
+        if self.pool:
+            await self.pool.close()
+            self.pool = None
+
+    @contextlib.asynccontextmanager
+    async def acquire(self):
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        conn = await self.pool.acquire()
+        waited_ms = (loop.time() - started) * 1000
+        self.metrics["checkouts"] += 1
+        self.metrics["wait_ms_total"] += waited_ms
+        self.metrics["wait_ms_max"] = max(self.metrics["wait_ms_max"], waited_ms)
+        if waited_ms >= 1:
+            self.metrics["waited"] += 1
+        self.in_use += 1
+        self.metrics["peak_in_use"] = max(self.metrics["peak_in_use"], self.in_use)
+        try:
+            yield conn
+        finally:
+            self.in_use -= 1
+            await self.pool.release(conn)
+
+    async def execute(self, query: str, *args):
+        async with self.acquire() as conn:
+            return await conn.execute(query, *args)
+
+    async def fetch(self, query: str, *args) -> List[asyncpg.Record]:
+        async with self.acquire() as conn:
+            return await conn.fetch(query, *args)
+
+    async def fetchrow(self, query: str, *args) -> Optional[asyncpg.Record]:
+        async with self.acquire() as conn:
+            return await conn.fetchrow(query, *args)
+
+    async def fetchval(self, query: str, *args):
+        async with self.acquire() as conn:
+            return await conn.fetchval(query, *args)
+
+    async def executemany(self, query: str, args):
+        async with self.acquire() as conn:
+            return await conn.executemany(query, args)
+
+    async def copy_records_to_table(self, table_name: str, **kwargs):
+        async with self.acquire() as conn:
+            return await conn.copy_records_to_table(table_name, **kwargs)
+
+    async def fetchrow_hot(self, name: str, *args) -> Optional[asyncpg.Record]:
+        async with self.acquire() as conn:
+            return await conn.fetchrow(HOT_QUERIES[name], *args)
+
+    async def fetchval_hot(self, name: str, *args):
+        async with self.acquire() as conn:
+            return await conn.fetchval(HOT_QUERIES[name], *args)
+
+
+db_pool = Database()
+
+
+@dataclass
+class WorkResult:
+    ok: bool
+    reason: Optional[str] = None
+    values: Dict[str, object] = field(default_factory=dict)
+
+
+class RollbackWork(Exception):
+    def __init__(self, result: WorkResult):
+        super().__init__(result.reason)
+        self.result = result
+
+
+async def unit_of_work(work: Callable[[asyncpg.Connection], Awaitable[WorkResult]]) -> WorkResult:
+    """Runs `work` in one transaction; replies go out only after it commits."""
+    async with db_pool.acquire() as conn:
+        conn.pending_balances.clear()
+        try:
+            async with conn.transaction():
+                result = await work(conn)
+                if not result.ok:
+                    raise RollbackWork(result)
+        except RollbackWork as rollback:
+            return rollback.result
+        finally:
+            committed = dict(conn.pending_balances)
+            conn.pending_balances.clear()
+        balance_cache.put_many(committed)
+    return result
 
 
 @dataclass
@@ -327,345 +568,1100 @@ def chunk_lines(lines: list[str], max_chars: int = 3500) -> list[str]:
     return chunks
 
 
-async def build_giveaway_entrants_output(
-    interaction: discord.Interaction,
-    giveaway_id: int,
-) -> tuple[str, list[str]]:
-    giveaway = await db_pool.fetchrow(
-        "SELECT id, prize, is_big, ended FROM giveaways WHERE id=$1",
-        giveaway_id,
-    )
-    if not giveaway:
-        return ("👻 Giveaway not found.", [])
+class MemberResolver:
+    def __init__(self, negative_ttl: int, concurrency: int):
+        self.negative_ttl = negative_ttl
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.missing: Dict[int, float] = {}
+
+    async def resolve(self, guild: discord.Guild, user_id: int) -> Optional[discord.Member]:
+        return (await self.resolve_many(guild, [user_id])).get(user_id)
+
+    async def resolve_many(self, guild: discord.Guild, user_ids: List[int]) -> Dict[int, Optional[discord.Member]]:
+        now = asyncio.get_running_loop().time()
+        if len(self.missing) > MEMBER_RESOLVER_MAX_MISSING:
+            self.missing = {uid: expires for uid, expires in self.missing.items() if expires > now}
+        resolved: Dict[int, Optional[discord.Member]] = {}
+        misses = []
+        for user_id in dict.fromkeys(user_ids):
+            member = guild.get_member(user_id)
+            if member:
+                resolved[user_id] = member
+            elif self.missing.get(user_id, 0) > now:
+                resolved[user_id] = None
+            else:
+                misses.append(user_id)
+        chunks = [misses[i:i + MEMBER_QUERY_CHUNK] for i in range(0, len(misses), MEMBER_QUERY_CHUNK)]
+        results = await asyncio.gather(*(self._query(guild, chunk) for chunk in chunks))
+        for chunk, found in zip(chunks, results):
+            by_id = {member.id: member for member in found or []}
+            for user_id in chunk:
+                member = by_id.get(user_id)
+                resolved[user_id] = member
+                if member is None and found is not None:
+                    self.missing[user_id] = now + self.negative_ttl
+        return resolved
+
+    async def _query(self, guild: discord.Guild, user_ids: List[int]) -> Optional[List[discord.Member]]:
+        async with self.semaphore:
+            try:
+                return await guild.query_members(user_ids=user_ids, limit=len(user_ids), cache=True)
+            except (asyncio.TimeoutError, discord.ClientException, discord.HTTPException):
+                return None
 
-    rows = await db_pool.fetch(
-        """
-        SELECT user_id, entries_spent
-        FROM giveaway_entries
-        WHERE giveaway_id=$1
-        ORDER BY entries_spent DESC
-        """,
-        giveaway_id,
-    )
-    if not rows:
-        return ("👻 No one has entered yet.", [])
 
-    total = sum(int(r["entries_spent"]) for r in rows)
-    total = max(1, total)
+member_resolver = MemberResolver(MEMBER_NEGATIVE_TTL_SECONDS, MEMBER_QUERY_CONCURRENCY)
 
-    guild = interaction.guild
-    lines: list[str] = []
-    for r in rows:
-        uid = int(r["user_id"])
-        spent = int(r["entries_spent"])
-        pct = (spent / total) * 100.0
 
-        member = None
-        if guild:
-            member = guild.get_member(uid)
-            if not member:
-                try:
-                    member = await guild.fetch_member(uid)
-                except (discord.NotFound, discord.Forbidden):
-                    member = None
+def invalidate_entrants_cache(giveaway_id: int):
+    entrants_cache.pop(giveaway_id, None)
 
-        rank_emoji = await get_economy_emoji_for_member(member)
-        mention = f"<@{uid}>"
-        lines.append(
-            f"{rank_emoji} {mention} {rank_emoji} — **{spent:,}** entries • **{pct:.2f}%** to win"
+
+async def get_entrants_summary(giveaway_id: int) -> Optional[Dict[str, object]]:
+    cached = entrants_cache.get(giveaway_id)
+    if cached and cached["expires_at"] > now_ts():
+        return cached
+    row = await db_pool.fetchrow(
+        "SELECT is_big, entrant_count, total_entries FROM giveaways WHERE id=$1",
+        giveaway_id,
+    )
+    if not row:
+        return None
+    summary = {
+        "is_big": row["is_big"],
+        "entrants": int(row["entrant_count"]),
+        "total": int(row["total_entries"]),
+        "pages": {},
+        "expires_at": now_ts() + ENTRANTS_CACHE_TTL_SECONDS,
+    }
+    entrants_cache[giveaway_id] = summary
+    return summary
+
+
+async def render_entrants_page(
+    guild: Optional[discord.Guild],
+    giveaway_id: int,
+    page: int,
+) -> Tuple[discord.Embed, int, int]:
+    summary = await get_entrants_summary(giveaway_id)
+    kind = "giveaway_big" if (summary and summary["is_big"]) else "giveaway_normal"
+    if not summary or not summary["entrants"]:
+        header = "👻 Giveaway not found." if not summary else "👻 No one has entered yet."
+        return build_embed(kind, "👻 Giveaway Entrants", header, [], include_banner=False), 0, 0
+
+    page_count = -(-summary["entrants"] // ENTRANTS_PAGE_SIZE)
+    page = max(0, min(page, page_count - 1))
+    total = max(1, summary["total"])
+    body = summary["pages"].get(page)
+    if body is None:
+        rows = await db_pool.fetch(
+            """
+            SELECT user_id, entries_spent
+            FROM giveaway_entries
+            WHERE giveaway_id=$1
+            ORDER BY entries_spent DESC, user_id
+            LIMIT $2 OFFSET $3
+            """,
+            giveaway_id,
+            ENTRANTS_PAGE_SIZE,
+            page * ENTRANTS_PAGE_SIZE,
         )
+        members = await member_resolver.resolve_many(guild, [int(r["user_id"]) for r in rows]) if guild else {}
+        lines: list[str] = []
+        for r in rows:
+            uid = int(r["user_id"])
+            spent = int(r["entries_spent"])
+            pct = (spent / total) * 100.0
+            rank_emoji = await get_economy_emoji_for_member(members.get(uid))
+            lines.append(
+                f"{rank_emoji} <@{uid}> {rank_emoji} — **{spent:,}** entries • **{pct:.2f}%** to win"
+            )
+        body = "\n".join(lines)
+        summary["pages"][page] = body
 
     header = f"👻 **Entrants** • Total entries: **{total:,}**"
-    chunks = chunk_lines(lines, max_chars=3500)
-    return (header, chunks)
+    embed = build_embed(kind, "👻 Giveaway Entrants", f"{header}\n\n{body}", [], include_banner=False)
+    embed.set_footer(text=f"Page {page + 1}/{page_count} • {summary['entrants']:,} entrants")
+    return embed, page, page_count
+
+
+HOT_PATH_INDEXES = [
+    ("giveaways_pending_idx", "giveaways (ends_at) WHERE ended = false OR announced = false"),
+    ("giveaway_entries_rank_idx", "giveaway_entries (giveaway_id, entries_spent DESC, user_id)"),
+    ("tickets_open_opener_idx", "tickets (opener_id) WHERE open = true"),
+    ("invite_codes_creator_expires_idx", "invite_codes (creator_id, expires_at)"),
+    ("invite_codes_invite_id_idx", "invite_codes (invite_id)"),
+    ("invite_codes_created_at_idx", "invite_codes (created_at)"),
+    ("invite_joins_valid_inviter_idx", "invite_joins (inviter_id, joined_at) WHERE valid = true"),
+    ("payout_items_unpaid_idx", "payout_items (payout_date, user_id) WHERE paid = false"),
+]
+
+
+@dataclass
+class Migration:
+    version: int
+    name: str
+    statements: List[str]
+    transactional: bool = True
+    indexes: List[str] = field(default_factory=list)
+
+    @property
+    def checksum(self) -> str:
+        return hashlib.sha256("\n;\n".join(self.statements).encode("utf-8")).hexdigest()
+
+
+BASELINE_STATEMENTS = [
+    """
+        CREATE TABLE IF NOT EXISTS users (
+            user_id BIGINT PRIMARY KEY,
+            entries BIGINT NOT NULL DEFAULT 0,
+            daily_messages INT NOT NULL DEFAULT 0,
+            last_daily_check BIGINT NOT NULL DEFAULT 0
+        );
+    """,
+    """
+        ALTER TABLE users
+        ADD COLUMN IF NOT EXISTS daily_messages INT NOT NULL DEFAULT 0,
+        ADD COLUMN IF NOT EXISTS last_daily_check BIGINT NOT NULL DEFAULT 0;
+    """,
+    """
+        CREATE TABLE IF NOT EXISTS logs (
+            id SERIAL PRIMARY KEY,
+            user_id BIGINT NULL,
+            action TEXT NOT NULL,
+            details TEXT NULL,
+            created_at BIGINT NOT NULL
+        );
+    """,
+    """
+        CREATE TABLE IF NOT EXISTS automod_state (
+            user_id BIGINT PRIMARY KEY,
+            last_msg_hash TEXT NULL,
+            last_msg_ts BIGINT NOT NULL DEFAULT 0,
+            streak_count INT NOT NULL DEFAULT 0,
+            last_streak_ts BIGINT NOT NULL DEFAULT 0,
+            no_entry_until BIGINT NOT NULL DEFAULT 0,
+            rng_cooldown_until BIGINT NOT NULL DEFAULT 0
+        );
+    """,
+    """
+        CREATE TABLE IF NOT EXISTS giveaways (
+            id SERIAL PRIMARY KEY,
+            message_id BIGINT NULL,
+            channel_id BIGINT NOT NULL,
+            prize TEXT NOT NULL,
+            winner_count INT NOT NULL,
+            is_big BOOLEAN NOT NULL DEFAULT FALSE,
+            ends_at BIGINT NOT NULL,
+            ended BOOLEAN NOT NULL DEFAULT FALSE,
+            created_by BIGINT NOT NULL,
+            created_at BIGINT NOT NULL
+        );
+    """,
+    """
+        CREATE TABLE IF NOT EXISTS giveaway_entries (
+            giveaway_id INT REFERENCES giveaways(id) ON DELETE CASCADE,
+            user_id BIGINT,
+            entries_spent BIGINT NOT NULL,
+            entered_at BIGINT NOT NULL,
+            PRIMARY KEY (giveaway_id, user_id)
+        );
+    """,
+    """
+        ALTER TABLE giveaways
+        ADD COLUMN IF NOT EXISTS announced BOOLEAN NOT NULL DEFAULT TRUE,
+        ADD COLUMN IF NOT EXISTS announce_lease BIGINT NOT NULL DEFAULT 0,
+        ADD COLUMN IF NOT EXISTS total_entries BIGINT NOT NULL DEFAULT 0,
+        ADD COLUMN IF NOT EXISTS entrant_count INT NOT NULL DEFAULT 0;
+    """,
+    """
+        UPDATE giveaways g
+        SET total_entries=t.total, entrant_count=t.entrants
+        FROM (
+            SELECT giveaway_id, SUM(entries_spent) AS total, COUNT(*) AS entrants
+            FROM giveaway_entries
+            GROUP BY giveaway_id
+        ) t
+        WHERE t.giveaway_id = g.id;
+    """,
+    """
+        CREATE TABLE IF NOT EXISTS giveaway_winners (
+            giveaway_id INT REFERENCES giveaways(id) ON DELETE CASCADE,
+            user_id BIGINT NOT NULL,
+            position INT NOT NULL,
+            PRIMARY KEY (giveaway_id, user_id)
+        );
+    """,
+    """
+        CREATE TABLE IF NOT EXISTS invite_event_state (
+            key TEXT PRIMARY KEY,
+            ends_at BIGINT NOT NULL,
+            last_reset BIGINT NOT NULL,
+            stock_3 INT NOT NULL,
+            stock_5 INT NOT NULL,
+            stock_10 INT NOT NULL,
+            panel_message_id BIGINT NULL
+        );
+    """,
+    """
+        CREATE TABLE IF NOT EXISTS invite_codes (
+            code TEXT PRIMARY KEY,
+            creator_id BIGINT NOT NULL,
+            invite_url TEXT NOT NULL,
+            invite_id TEXT NOT NULL,
+            created_at BIGINT NOT NULL,
+            expires_at BIGINT NOT NULL,
+            uses_total INT NOT NULL DEFAULT 0,
+            valid_uses INT NOT NULL DEFAULT 0,
+            invalid_uses INT NOT NULL DEFAULT 0
+        );
+    """,
+    """
+        CREATE TABLE IF NOT EXISTS invite_joins (
+            invited_id BIGINT PRIMARY KEY,
+            invite_id TEXT NOT NULL,
+            code TEXT REFERENCES invite_codes(code),
+            inviter_id BIGINT NOT NULL,
+            joined_at BIGINT NOT NULL,
+            valid BOOLEAN NOT NULL,
+            invalid_reason TEXT NULL
+        );
+    """,
+    """
+        ALTER TABLE invite_codes ALTER COLUMN invite_id TYPE TEXT USING invite_id::text;
+    """,
+    """
+        ALTER TABLE invite_joins ALTER COLUMN invite_id TYPE TEXT USING invite_id::text;
+    """,
+    """
+        CREATE TABLE IF NOT EXISTS tickets (
+            channel_id BIGINT PRIMARY KEY,
+            opener_id BIGINT NOT NULL,
+            open BOOLEAN NOT NULL DEFAULT TRUE,
+            created_at BIGINT NOT NULL,
+            closed_at BIGINT NULL
+        );
+    """,
+    """
+        CREATE TABLE IF NOT EXISTS panels (
+            key TEXT PRIMARY KEY,
+            channel_id BIGINT NOT NULL,
+            message_id BIGINT NOT NULL,
+            updated_at BIGINT NOT NULL
+        );
+    """,
+    """
+        CREATE TABLE IF NOT EXISTS payout_runs (
+            payout_date DATE PRIMARY KEY,
+            status TEXT NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'completed')),
+            users_total INT NOT NULL DEFAULT 0,
+            created_at BIGINT NOT NULL,
+            completed_at BIGINT NULL
+        );
+    """,
+    """
+        CREATE TABLE IF NOT EXISTS payout_items (
+            payout_date DATE REFERENCES payout_runs(payout_date) ON DELETE CASCADE,
+            user_id BIGINT NOT NULL,
+            role_reward BIGINT NOT NULL DEFAULT 0,
+            role_name TEXT NULL,
+            booster_reward BIGINT NOT NULL DEFAULT 0,
+            paid BOOLEAN NOT NULL DEFAULT FALSE,
+            PRIMARY KEY (payout_date, user_id)
+        );
+    """,
+    """
+        CREATE TABLE IF NOT EXISTS generator_stock (
+            id SERIAL PRIMARY KEY,
+            tier TEXT NOT NULL CHECK (tier IN ('free', 'premium', 'op')),
+            username TEXT NOT NULL,
+            password TEXT NOT NULL,
+            claimed BOOLEAN NOT NULL DEFAULT FALSE,
+            added_by BIGINT NOT NULL,
+            added_at BIGINT NOT NULL,
+            claimed_by BIGINT NULL,
+            claimed_at BIGINT NULL
+        );
+    """,
+    """
+        CREATE TABLE IF NOT EXISTS generator_cooldowns (
+            user_id BIGINT PRIMARY KEY,
+            last_gen BIGINT NOT NULL
+        );
+    """,
+    """
+        CREATE TABLE IF NOT EXISTS generator_stats (
+            tier TEXT PRIMARY KEY CHECK (tier IN ('free', 'premium', 'op')),
+            global_generations BIGINT NOT NULL DEFAULT 0
+        );
+    """,
+    """
+        ALTER TABLE generator_stats
+        ADD COLUMN IF NOT EXISTS global_generations BIGINT NOT NULL DEFAULT 0;
+    """,
+    """
+        ALTER TABLE generator_stats
+        DROP COLUMN IF EXISTS total_generations;
+    """,
+    """
+        INSERT INTO generator_stats (tier, global_generations)
+        VALUES ('free', 0), ('premium', 0), ('op', 0)
+        ON CONFLICT (tier) DO NOTHING;
+    """,
+]
+
+LEDGER_STATEMENTS = [
+    """
+        CREATE TABLE IF NOT EXISTS entries_ledger (
+            id BIGSERIAL,
+            user_id BIGINT NOT NULL,
+            delta BIGINT NOT NULL,
+            source TEXT NOT NULL,
+            ref_id TEXT NULL,
+            ts BIGINT NOT NULL,
+            PRIMARY KEY (id, ts)
+        ) PARTITION BY RANGE (ts);
+    """,
+    """
+        CREATE TABLE IF NOT EXISTS entries_ledger_default PARTITION OF entries_ledger DEFAULT;
+    """,
+    """
+        CREATE INDEX IF NOT EXISTS entries_ledger_user_ts_idx ON entries_ledger (user_id, ts);
+    """,
+    """
+        CREATE TABLE IF NOT EXISTS balance_snapshots (
+            user_id BIGINT PRIMARY KEY,
+            entries BIGINT NOT NULL,
+            as_of BIGINT NOT NULL
+        );
+    """,
+    """
+        CREATE TABLE IF NOT EXISTS balance_snapshot_runs (
+            as_of BIGINT PRIMARY KEY,
+            users_changed INT NOT NULL,
+            mismatches INT NOT NULL,
+            created_at BIGINT NOT NULL
+        );
+    """,
+    """
+        LOCK TABLE users IN SHARE MODE;
+    """,
+    """
+        INSERT INTO entries_ledger (user_id, delta, source, ts)
+        SELECT user_id, entries, 'opening_balance', 0
+        FROM users
+        WHERE entries <> 0;
+    """,
+]
+
+MIGRATIONS = [
+    Migration(1, "baseline", BASELINE_STATEMENTS),
+    Migration(
+        2,
+        "hot_path_indexes",
+        [f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}" for name, definition in HOT_PATH_INDEXES],
+        transactional=False,
+        indexes=[name for name, _ in HOT_PATH_INDEXES],
+    ),
+    Migration(3, "entries_ledger", LEDGER_STATEMENTS),
+]
+
+
+async def fetch_applied_migrations(conn: asyncpg.Connection) -> Dict[int, str]:
+    try:
+        rows = await conn.fetch("SELECT version, checksum FROM schema_migrations")
+    except asyncpg.UndefinedTableError:
+        return {}
+    return {row["version"]: row["checksum"] for row in rows}
+
+
+def pending_migrations(applied: Dict[int, str]) -> List[Migration]:
+    pending = []
+    for migration in MIGRATIONS:
+        checksum = applied.get(migration.version)
+        if checksum is None:
+            pending.append(migration)
+        elif checksum != migration.checksum:
+            raise RuntimeError(
+                f"Migration {migration.version:04d}_{migration.name} changed after it was applied"
+            )
+    return pending
+
+
+async def apply_migration(conn: asyncpg.Connection, migration: Migration):
+    record = "INSERT INTO schema_migrations (version, name, checksum, applied_at) VALUES ($1, $2, $3, $4)"
+    if migration.transactional:
+        async with conn.transaction():
+            for statement in migration.statements:
+                await conn.execute(statement)
+            await conn.execute(record, migration.version, migration.name, migration.checksum, now_ts())
+        return
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction. An interrupted
+    # build leaves an invalid index that IF NOT EXISTS would skip, so drop those first.
+    # Only this migration's own indexes: another session's in-progress build is invalid too.
+    invalid = await conn.fetch(
+        """
+        SELECT c.relname
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = current_schema() AND NOT i.indisvalid AND c.relname = ANY($1::text[])
+        """,
+        migration.indexes,
+    )
+    for row in invalid:
+        await conn.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{row["relname"]}"')
+    for statement in migration.statements:
+        await conn.execute(statement)
+    await conn.execute(record, migration.version, migration.name, migration.checksum, now_ts())
 
 
 async def run_migrations():
     async with db_pool.acquire() as conn:
-        invite_tables = {
-            "invite_codes": "invite_id",
-            "invite_joins": "invite_id",
-        }
-        for table, column in invite_tables.items():
-            data_type = await conn.fetchval(
+        if not pending_migrations(await fetch_applied_migrations(conn)):
+            return
+        await conn.execute("SELECT pg_advisory_lock($1)", MIGRATION_LOCK_KEY)
+        try:
+            await conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS schema_migrations (
+                    version INT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    checksum TEXT NOT NULL,
+                    applied_at BIGINT NOT NULL
+                );
                 """
-                SELECT data_type
-                FROM information_schema.columns
-                WHERE table_schema='public' AND table_name=$1 AND column_name=$2
-                """,
-                table,
-                column,
             )
-            if data_type and data_type != "text":
-                await conn.execute(
-                    f"ALTER TABLE {table} ALTER COLUMN {column} TYPE TEXT USING {column}::text"
-                )
-        await conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS users (
-                user_id BIGINT PRIMARY KEY,
-                entries BIGINT NOT NULL DEFAULT 0,
-                daily_messages INT NOT NULL DEFAULT 0,
-                last_daily_check BIGINT NOT NULL DEFAULT 0
-            );
-            """
-        )
-        await conn.execute(
-            """
-            ALTER TABLE users
-            ADD COLUMN IF NOT EXISTS daily_messages INT NOT NULL DEFAULT 0,
-            ADD COLUMN IF NOT EXISTS last_daily_check BIGINT NOT NULL DEFAULT 0;
-            """
-        )
-        await conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS logs (
-                id SERIAL PRIMARY KEY,
-                user_id BIGINT NULL,
-                action TEXT NOT NULL,
-                details TEXT NULL,
-                created_at BIGINT NOT NULL
-            );
-            """
-        )
-        await conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS automod_state (
-                user_id BIGINT PRIMARY KEY,
-                last_msg_hash TEXT NULL,
-                last_msg_ts BIGINT NOT NULL DEFAULT 0,
-                streak_count INT NOT NULL DEFAULT 0,
-                last_streak_ts BIGINT NOT NULL DEFAULT 0,
-                no_entry_until BIGINT NOT NULL DEFAULT 0,
-                rng_cooldown_until BIGINT NOT NULL DEFAULT 0
-            );
-            """
-        )
-        await conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS giveaways (
-                id SERIAL PRIMARY KEY,
-                message_id BIGINT NULL,
-                channel_id BIGINT NOT NULL,
-                prize TEXT NOT NULL,
-                winner_count INT NOT NULL,
-                is_big BOOLEAN NOT NULL DEFAULT FALSE,
-                ends_at BIGINT NOT NULL,
-                ended BOOLEAN NOT NULL DEFAULT FALSE,
-                created_by BIGINT NOT NULL,
-                created_at BIGINT NOT NULL
-            );
-            """
-        )
-        await conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS giveaway_entries (
-                giveaway_id INT REFERENCES giveaways(id) ON DELETE CASCADE,
-                user_id BIGINT,
-                entries_spent BIGINT NOT NULL,
-                entered_at BIGINT NOT NULL,
-                PRIMARY KEY (giveaway_id, user_id)
-            );
-            """
-        )
-        await conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS invite_event_state (
-                key TEXT PRIMARY KEY,
-                ends_at BIGINT NOT NULL,
-                last_reset BIGINT NOT NULL,
-                stock_3 INT NOT NULL,
-                stock_5 INT NOT NULL,
-                stock_10 INT NOT NULL,
-                panel_message_id BIGINT NULL
-            );
-            """
-        )
-        await conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS invite_codes (
-                code TEXT PRIMARY KEY,
-                creator_id BIGINT NOT NULL,
-                invite_url TEXT NOT NULL,
-                invite_id TEXT NOT NULL,
-                created_at BIGINT NOT NULL,
-                expires_at BIGINT NOT NULL,
-                uses_total INT NOT NULL DEFAULT 0,
-                valid_uses INT NOT NULL DEFAULT 0,
-                invalid_uses INT NOT NULL DEFAULT 0
-            );
-            """
-        )
-        await conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS invite_joins (
-                invited_id BIGINT PRIMARY KEY,
-                invite_id TEXT NOT NULL,
-                code TEXT REFERENCES invite_codes(code),
-                inviter_id BIGINT NOT NULL,
-                joined_at BIGINT NOT NULL,
-                valid BOOLEAN NOT NULL,
-                invalid_reason TEXT NULL
-            );
-            """
-        )
-        await conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS tickets (
-                channel_id BIGINT PRIMARY KEY,
-                opener_id BIGINT NOT NULL,
-                open BOOLEAN NOT NULL DEFAULT TRUE,
-                created_at BIGINT NOT NULL,
-                closed_at BIGINT NULL
-            );
-            """
-        )
-        await conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS panels (
-                key TEXT PRIMARY KEY,
-                channel_id BIGINT NOT NULL,
-                message_id BIGINT NOT NULL,
-                updated_at BIGINT NOT NULL
-            );
-            """
-        )
-        await conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS generator_stock (
-                id SERIAL PRIMARY KEY,
-                tier TEXT NOT NULL CHECK (tier IN ('free', 'premium', 'op')),
-                username TEXT NOT NULL,
-                password TEXT NOT NULL,
-                claimed BOOLEAN NOT NULL DEFAULT FALSE,
-                added_by BIGINT NOT NULL,
-                added_at BIGINT NOT NULL,
-                claimed_by BIGINT NULL,
-                claimed_at BIGINT NULL
-            );
-            """
+            for migration in pending_migrations(await fetch_applied_migrations(conn)):
+                await apply_migration(conn, migration)
+        finally:
+            await conn.execute("SELECT pg_advisory_unlock($1)", MIGRATION_LOCK_KEY)
+
+
+class BalanceCache:
+    def __init__(self, max_users: int):
+        self.max_users = max_users
+        self.balances: Dict[int, int] = {}
+        self.loading: Dict[int, asyncio.Task] = {}
+        self.metrics = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.metrics["hits"] + self.metrics["misses"]
+        return self.metrics["hits"] / lookups if lookups else 0.0
+
+    async def get(self, user_id: int) -> int:
+        balance = self.balances.pop(user_id, None)
+        if balance is not None:
+            self.balances[user_id] = balance
+            self.metrics["hits"] += 1
+            return balance
+        self.metrics["misses"] += 1
+        task = self.loading.get(user_id)
+        if task is None:
+            task = asyncio.create_task(db_pool.fetchval_hot("user_entries", user_id))
+            self.loading[user_id] = task
+        try:
+            loaded = await task
+        finally:
+            self.loading.pop(user_id, None)
+        if user_id in self.balances:
+            # A write landed while the read was in flight; it is newer.
+            return self.balances[user_id]
+        self._store(user_id, int(loaded or 0))
+        return int(loaded or 0)
+
+    def put(self, user_id: int, balance: int):
+        self.metrics["writes"] += 1
+        self.balances.pop(user_id, None)
+        self._store(user_id, balance)
+
+    def put_many(self, balances: Dict[int, int]):
+        for user_id, balance in balances.items():
+            self.put(user_id, balance)
+
+    def _store(self, user_id: int, balance: int):
+        self.balances[user_id] = balance
+        while len(self.balances) > self.max_users:
+            self.balances.pop(next(iter(self.balances)))
+            self.metrics["evictions"] += 1
+
+
+balance_cache = BalanceCache(BALANCE_CACHE_MAX_USERS)
+
+
+@dataclass
+class BalanceChange:
+    user_id: int
+    old_balance: int
+    new_balance: int
+
+
+class EntriesLedger:
+    """The only way balances change."""
+
+    def _track(self, conn: asyncpg.Connection, change: BalanceChange):
+        if conn.is_in_transaction():
+            conn.pending_balances[change.user_id] = change.new_balance
+        else:
+            balance_cache.put(change.user_id, change.new_balance)
+
+    async def credit(
+        self,
+        conn: asyncpg.Connection,
+        user_id: int,
+        amount: int,
+        source: str,
+        ref_id: Optional[str] = None,
+    ) -> BalanceChange:
+        new_balance = await conn.fetchval(
+            HOT_QUERIES["ledger_credit"], user_id, amount, source, ref_id, now_ts()
         )
-        await conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS generator_cooldowns (
-                user_id BIGINT PRIMARY KEY,
-                last_gen BIGINT NOT NULL
-            );
-            """
+        change = BalanceChange(user_id, new_balance - amount, new_balance)
+        self._track(conn, change)
+        return change
+
+    async def debit(
+        self,
+        conn: asyncpg.Connection,
+        user_id: int,
+        amount: int,
+        source: str,
+        ref_id: Optional[str] = None,
+    ) -> Optional[BalanceChange]:
+        return await self.adjust(conn, user_id, -amount, amount, source, ref_id)
+
+    async def adjust(
+        self,
+        conn: asyncpg.Connection,
+        user_id: int,
+        delta: int,
+        minimum_balance: int,
+        source: str,
+        ref_id: Optional[str] = None,
+    ) -> Optional[BalanceChange]:
+        """Applies `delta` only if the balance is at least `minimum_balance`; None otherwise."""
+        new_balance = await conn.fetchval(
+            HOT_QUERIES["ledger_adjust"], user_id, delta, minimum_balance, source, ref_id, now_ts()
         )
-        await conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS generator_stats (
-                tier TEXT PRIMARY KEY CHECK (tier IN ('free', 'premium', 'op')),
-                global_generations BIGINT NOT NULL DEFAULT 0
-            );
-            """
-        )
-        await conn.execute(
-            """
-            ALTER TABLE generator_stats
-            ADD COLUMN IF NOT EXISTS global_generations BIGINT NOT NULL DEFAULT 0;
+        if new_balance is None:
+            return None
+        change = BalanceChange(user_id, new_balance - delta, new_balance)
+        self._track(conn, change)
+        return change
+
+    async def transfer(
+        self,
+        conn: asyncpg.Connection,
+        from_user_id: int,
+        to_user_id: int,
+        amount: int,
+        source: str,
+        ref_id: Optional[str] = None,
+    ) -> Optional[Tuple[BalanceChange, BalanceChange]]:
+        if from_user_id == to_user_id:
+            raise ValueError("Cannot transfer entries to the same user")
+        row = await conn.fetchrow(
             """
+            WITH debited AS (
+                UPDATE users
+                SET entries = entries - $3
+                WHERE user_id=$1 AND entries >= $3
+                RETURNING entries
+            ), credited AS (
+                INSERT INTO users (user_id, entries, daily_messages, last_daily_check)
+                SELECT $2, $3, 0, 0 FROM debited
+                ON CONFLICT (user_id) DO UPDATE SET entries = users.entries + EXCLUDED.entries
+                RETURNING entries
+            ), recorded AS (
+                INSERT INTO entries_ledger (user_id, delta, source, ref_id, ts)
+                SELECT $1, -$3, $4::text, $5::text, $6::bigint FROM credited
+                UNION ALL
+                SELECT $2, $3, $4::text, $5::text, $6::bigint FROM credited
+            )
+            SELECT debited.entries AS from_entries, credited.entries AS to_entries
+            FROM debited, credited
+            """,
+            from_user_id,
+            to_user_id,
+            amount,
+            source,
+            ref_id,
+            now_ts(),
         )
-        await conn.execute(
-            """
-            ALTER TABLE generator_stats
-            DROP COLUMN IF EXISTS total_generations;
+        if not row:
+            return None
+        debited = BalanceChange(from_user_id, row["from_entries"] + amount, row["from_entries"])
+        credited = BalanceChange(to_user_id, row["to_entries"] - amount, row["to_entries"])
+        self._track(conn, debited)
+        self._track(conn, credited)
+        return debited, credited
+
+    async def credit_messages(
+        self,
+        conn: asyncpg.Connection,
+        user_ids: List[int],
+        amounts: List[int],
+        messages: List[int],
+        source: str,
+    ) -> Dict[int, BalanceChange]:
+        rows = await conn.fetch(
             """
+            WITH batch AS (
+                SELECT *
+                FROM UNNEST($1::bigint[], $2::bigint[], $3::int[]) AS t(user_id, award, messages)
+            ), credited AS (
+                INSERT INTO users (user_id, entries, daily_messages, last_daily_check)
+                SELECT user_id, award, messages, 0 FROM batch
+                ON CONFLICT (user_id)
+                DO UPDATE SET entries = users.entries + EXCLUDED.entries,
+                              daily_messages = users.daily_messages + EXCLUDED.daily_messages
+                RETURNING user_id, entries
+            ), recorded AS (
+                INSERT INTO entries_ledger (user_id, delta, source, ts)
+                SELECT user_id, award, $4, $5 FROM batch WHERE award <> 0
+            )
+            SELECT user_id, entries FROM credited
+            """,
+            user_ids,
+            amounts,
+            messages,
+            source,
+            now_ts(),
         )
+        awarded = dict(zip(user_ids, amounts))
+        changes = {}
+        for row in rows:
+            user_id = row["user_id"]
+            new_balance = int(row["entries"])
+            changes[user_id] = BalanceChange(user_id, new_balance - awarded[user_id], new_balance)
+            self._track(conn, changes[user_id])
+        return changes
+
+
+entries_ledger = EntriesLedger()
+
+
+def month_start(year: int, month: int) -> int:
+    year, month = year + (month - 1) // 12, (month - 1) % 12 + 1
+    return int(datetime(year, month, 1, tzinfo=timezone.utc).timestamp())
+
+
+async def create_ledger_partition(conn: asyncpg.Connection, name: str, start: int, end: int):
+    # Rows that arrived before their month existed sit in the default partition and
+    # would block a plain CREATE ... PARTITION OF, so move them across and attach.
+    async with conn.transaction():
+        if await conn.fetchval("SELECT to_regclass($1)", name):
+            return
+        await conn.execute("LOCK TABLE entries_ledger_default IN SHARE ROW EXCLUSIVE MODE")
+        await conn.execute(f"CREATE TABLE {name} (LIKE entries_ledger INCLUDING DEFAULTS)")
         await conn.execute(
-            """
-            INSERT INTO generator_stats (tier, global_generations)
-            VALUES ('free', 0), ('premium', 0), ('op', 0)
-            ON CONFLICT (tier) DO NOTHING;
-            """
+            f"""
+            WITH moved AS (
+                DELETE FROM entries_ledger_default WHERE ts >= $1 AND ts < $2 RETURNING *
+            )
+            INSERT INTO {name} SELECT * FROM moved
+            """,
+            start,
+            end,
         )
+        await conn.execute(f"ALTER TABLE entries_ledger ATTACH PARTITION {name} FOR VALUES FROM ({start}) TO ({end})")
+
+
+ledger_partitions: set[str] = set()
+
+
+async def ensure_ledger_partitions(conn: asyncpg.Connection):
+    today = datetime.now(timezone.utc)
+    for offset in range(LEDGER_PARTITIONS_AHEAD + 1):
+        year, month = today.year, today.month + offset
+        start = month_start(year, month)
+        end = month_start(year, month + 1)
+        name = datetime.fromtimestamp(start, timezone.utc).strftime("entries_ledger_%Y_%m")
+        if name in ledger_partitions:
+            continue
+        try:
+            await create_ledger_partition(conn, name, start, end)
+        except asyncpg.PostgresError as exc:
+            log_event("ledger_partition_failed", None, {"partition": name, "error": str(exc)})
+            continue
+        ledger_partitions.add(name)
 
 
-async def get_or_create_user(user_id: int) -> Dict[str, int]:
+async def snapshot_balances() -> Dict[str, int]:
+    as_of = now_ts() - LEDGER_SNAPSHOT_LAG_SECONDS
     async with db_pool.acquire() as conn:
-        row = await conn.fetchrow(
-            "SELECT user_id, entries, daily_messages, last_daily_check FROM users WHERE user_id=$1",
-            user_id,
+        await ensure_ledger_partitions(conn)
+        async with conn.transaction(isolation="repeatable_read"):
+            previous = await conn.fetchval("SELECT MAX(as_of) FROM balance_snapshot_runs")
+            if previous is None:
+                previous = -1
+            changed = 0
+            if as_of > previous:
+                status = await conn.execute(
+                    """
+                    INSERT INTO balance_snapshots (user_id, entries, as_of)
+                    SELECT user_id, SUM(delta), $2
+                    FROM entries_ledger
+                    WHERE ts > $1 AND ts <= $2
+                    GROUP BY user_id
+                    ON CONFLICT (user_id)
+                    DO UPDATE SET entries = balance_snapshots.entries + EXCLUDED.entries, as_of = EXCLUDED.as_of
+                    """,
+                    previous,
+                    as_of,
+                )
+                changed = int(status.split()[-1])
+            else:
+                as_of = previous
+            mismatches = await conn.fetch(
+                """
+                SELECT u.user_id, u.entries, COALESCE(s.entries, 0) + COALESCE(d.delta, 0) AS expected
+                FROM users u
+                LEFT JOIN balance_snapshots s ON s.user_id = u.user_id
+                LEFT JOIN (
+                    SELECT user_id, SUM(delta) AS delta
+                    FROM entries_ledger
+                    WHERE ts > $1
+                    GROUP BY user_id
+                ) d ON d.user_id = u.user_id
+                WHERE u.entries <> COALESCE(s.entries, 0) + COALESCE(d.delta, 0)
+                """,
+                as_of,
+            )
+            await conn.execute(
+                """
+                INSERT INTO balance_snapshot_runs (as_of, users_changed, mismatches, created_at)
+                VALUES ($1, $2, $3, $4)
+                ON CONFLICT (as_of) DO UPDATE SET mismatches = EXCLUDED.mismatches, created_at = EXCLUDED.created_at
+                """,
+                as_of,
+                changed,
+                len(mismatches),
+                now_ts(),
+            )
+    for row in mismatches[:LEDGER_MISMATCH_LOG_LIMIT]:
+        log_event(
+            "ledger_mismatch",
+            row["user_id"],
+            {"balance": row["entries"], "ledger_balance": row["expected"], "as_of": as_of},
         )
+    return {"as_of": as_of, "users_changed": changed, "mismatches": len(mismatches)}
+
+
+async def ledger_snapshot_loop():
+    while True:
+        try:
+            await snapshot_balances()
+        except Exception:
+            pass
+        await asyncio.sleep(LEDGER_SNAPSHOT_INTERVAL_SECONDS)
+
+
+AUTOMOD_STATE_FIELDS = (
+    "last_msg_hash",
+    "last_msg_ts",
+    "streak_count",
+    "last_streak_ts",
+    "no_entry_until",
+    "rng_cooldown_until",
+)
+
+
+class AutomodStateCache:
+    def __init__(self, flush_interval_ms: int, max_users: int):
+        self.flush_interval = max(0.05, flush_interval_ms / 1000)
+        self.max_users = max_users
+        self.states: Dict[int, Dict[str, object]] = {}
+        self.dirty: set[int] = set()
+        self.loading: Dict[int, asyncio.Task] = {}
+        self.flush_lock = asyncio.Lock()
+
+    async def get(self, user_id: int) -> Dict[str, object]:
+        state = self.states.pop(user_id, None)
+        if state is not None:
+            self.states[user_id] = state
+            return state
+        task = self.loading.get(user_id)
+        if task is None:
+            task = asyncio.create_task(self._load(user_id))
+            self.loading[user_id] = task
+        try:
+            loaded = await task
+        finally:
+            self.loading.pop(user_id, None)
+        return self.states.setdefault(user_id, loaded)
+
+    async def _load(self, user_id: int) -> Dict[str, object]:
+        row = await db_pool.fetchrow_hot("automod_state", user_id)
         if row:
             return dict(row)
-        await conn.execute(
-            """
-            INSERT INTO users (user_id, entries, daily_messages, last_daily_check)
-            VALUES ($1, $2, $3, $4)
-            """,
-            user_id,
-            0,
-            0,
-            0,
-        )
-        return {"user_id": user_id, "entries": 0, "daily_messages": 0, "last_daily_check": 0}
+        return {
+            "last_msg_hash": None,
+            "last_msg_ts": 0,
+            "streak_count": 0,
+            "last_streak_ts": 0,
+            "no_entry_until": 0,
+            "rng_cooldown_until": 0,
+        }
 
+    def update(self, user_id: int, **fields):
+        state = self.states.get(user_id)
+        if state is None:
+            return
+        state.update(fields)
+        self.dirty.add(user_id)
 
-async def ensure_user(conn: asyncpg.Connection, user_id: int):
-    await conn.execute(
-        """
-        INSERT INTO users (user_id, entries, daily_messages, last_daily_check)
-        VALUES ($1, 0, 0, 0)
-        ON CONFLICT (user_id) DO NOTHING
-        """,
-        user_id,
-    )
+    async def flush(self):
+        async with self.flush_lock:
+            if not self.dirty:
+                self._evict()
+                return
+            user_ids = [uid for uid in self.dirty if uid in self.states]
+            self.dirty.clear()
+            columns = [[self.states[uid][field] for uid in user_ids] for field in AUTOMOD_STATE_FIELDS]
+            try:
+                await db_pool.execute(
+                    """
+                    INSERT INTO automod_state (
+                        user_id, last_msg_hash, last_msg_ts, streak_count,
+                        last_streak_ts, no_entry_until, rng_cooldown_until
+                    )
+                    SELECT * FROM UNNEST(
+                        $1::bigint[], $2::text[], $3::bigint[], $4::int[],
+                        $5::bigint[], $6::bigint[], $7::bigint[]
+                    )
+                    ON CONFLICT (user_id) DO UPDATE SET
+                        last_msg_hash=EXCLUDED.last_msg_hash,
+                        last_msg_ts=EXCLUDED.last_msg_ts,
+                        streak_count=EXCLUDED.streak_count,
+                        last_streak_ts=EXCLUDED.last_streak_ts,
+                        no_entry_until=EXCLUDED.no_entry_until,
+                        rng_cooldown_until=EXCLUDED.rng_cooldown_until
+                    """,
+                    user_ids,
+                    *columns,
+                )
+            except Exception:
+                self.dirty.update(user_ids)
+                raise
+            self._evict()
+
+    def _evict(self):
+        overflow = len(self.states) - self.max_users
+        if overflow <= 0:
+            return
+        for uid in [uid for uid in self.states if uid not in self.dirty][:overflow]:
+            del self.states[uid]
 
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception:
+                await asyncio.sleep(5)
 
-async def increment_daily_message(user_id: int):
-    await db_pool.execute(
-        """
-        INSERT INTO users (user_id, entries, daily_messages, last_daily_check)
-        VALUES ($1, 0, 1, 0)
-        ON CONFLICT (user_id)
-        DO UPDATE SET daily_messages = users.daily_messages + 1
-        """,
-        user_id,
-    )
 
+automod_cache = AutomodStateCache(AUTOMOD_FLUSH_INTERVAL_MS, AUTOMOD_CACHE_MAX_USERS)
+shutdown_hooks.append(automod_cache.flush)
 
-async def update_user_roles(member: discord.Member, entries: int):
-    for emoji, name, role_id, required, _ in reversed(RANKS):
-        if entries >= required:
-            role = member.guild.get_role(role_id)
-            if role and role not in member.roles:
-                await member.add_roles(role)
-            for _, _, rid, _, _ in RANKS:
-                if rid != role_id:
-                    r = member.guild.get_role(rid)
-                    if r in member.roles:
-                        await member.remove_roles(r)
-            break
 
+class RankIndex:
+    def __init__(self, ranks: List[tuple]):
+        self.ranks = sorted(ranks, key=lambda rank: rank[3])
+        self.thresholds = [rank[3] for rank in self.ranks]
+        self.by_role_id = {rank[2]: position for position, rank in enumerate(self.ranks)}
+        self.roles: Dict[int, discord.Role] = {}
 
-async def log_event(action: str, user_id: Optional[int], details: str):
-    created_ts = now_ts()
-    detail_text = (details or "")[:500]
-    try:
-        await db_pool.execute(
-            "INSERT INTO logs (user_id, action, details, created_at) VALUES ($1, $2, $3, $4)",
-            user_id,
-            action,
-            detail_text,
-            created_ts,
-        )
-    except Exception:
-        pass
+    def refresh(self, guild: Optional[discord.Guild]):
+        if not guild:
+            return
+        roles = {}
+        for role_id in self.by_role_id:
+            role = guild.get_role(role_id)
+            if role:
+                roles[role_id] = role
+        self.roles = roles
+
+    def is_rank_role(self, role_id: int) -> bool:
+        return role_id in self.by_role_id
+
+    def role(self, guild: discord.Guild, role_id: int) -> Optional[discord.Role]:
+        role = self.roles.get(role_id)
+        if role is None:
+            role = guild.get_role(role_id)
+            if role:
+                self.roles[role_id] = role
+        return role
+
+    def for_balance(self, entries: int) -> Optional[tuple]:
+        position = bisect_right(self.thresholds, entries) - 1
+        return self.ranks[position] if position >= 0 else None
+
+    def highest_held(self, member: Optional[discord.Member]) -> Optional[tuple]:
+        if not member:
+            return None
+        best = -1
+        for role in member.roles:
+            position = self.by_role_id.get(role.id, -1)
+            if position > best:
+                best = position
+        return self.ranks[best] if best >= 0 else None
+
+
+rank_index = RankIndex(RANKS)
+
+
+class RankReconciler:
+    def __init__(self, debounce_ms: int, interval_ms: int):
+        self.debounce = max(0.0, debounce_ms / 1000)
+        self.interval = max(0.0, interval_ms / 1000)
+        self.pending: Dict[int, List[object]] = {}
+        self.ready = asyncio.Event()
+        self.metrics = {"scheduled": 0, "coalesced": 0, "skipped": 0, "edits": 0, "failed": 0}
+
+    def desired_roles(self, member: discord.Member, entries: int) -> Optional[List[discord.Role]]:
+        rank = rank_index.for_balance(entries)
+        if not rank:
+            return None
+        current = [role for role in member.roles if not role.is_default()]
+        held_ranks = {role.id for role in current if rank_index.is_rank_role(role.id)}
+        target_role = rank_index.role(member.guild, rank[2])
+        wanted_ranks = {target_role.id} if target_role else set()
+        if held_ranks == wanted_ranks:
+            return None
+        roles = [role for role in current if not rank_index.is_rank_role(role.id)]
+        if target_role:
+            roles.append(target_role)
+        return roles
+
+    def schedule(self, member: discord.Member, entries: int):
+        self.metrics["scheduled"] += 1
+        entry = self.pending.get(member.id)
+        if entry:
+            entry[0] = member
+            entry[1] = entries
+            self.metrics["coalesced"] += 1
+            return
+        if self.desired_roles(member, entries) is None:
+            self.metrics["skipped"] += 1
+            return
+        due = asyncio.get_running_loop().time() + self.debounce
+        self.pending[member.id] = [member, entries, due]
+        self.ready.set()
+
+    async def apply(self, member: discord.Member, entries: int):
+        member = member.guild.get_member(member.id) or member
+        roles = self.desired_roles(member, entries)
+        if roles is None:
+            self.metrics["skipped"] += 1
+            return
+        try:
+            await member.edit(roles=roles, reason="Rank sync")
+        except discord.HTTPException:
+            self.metrics["failed"] += 1
+            return
+        self.metrics["edits"] += 1
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self.pending:
+                self.ready.clear()
+                await self.ready.wait()
+                continue
+            user_id = next(iter(self.pending))
+            delay = self.pending[user_id][2] - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            member, entries, _ = self.pending.pop(user_id)
+            try:
+                await self.apply(member, entries)
+            except Exception as exc:
+                self.metrics["failed"] += 1
+                log_event("rank_sync_failed", user_id, {"error": str(exc)})
+            await asyncio.sleep(self.interval)
+
+
+rank_reconciler = RankReconciler(RANK_DEBOUNCE_MS, ROLE_SYNC_INTERVAL_MS)
+
+
+class MessageUpdater:
+    def __init__(self, interval: int):
+        self.interval = max(0, interval)
+        self.pending: Dict[object, List[object]] = {}
+        self.last_run: Dict[object, float] = {}
+        self.ready = asyncio.Event()
+        self.metrics = {"marked": 0, "coalesced": 0, "edits": 0, "failed": 0}
+
+    def mark(self, key: object, refresh: Callable[[], Awaitable[None]]):
+        self.metrics["marked"] += 1
+        entry = self.pending.get(key)
+        if entry:
+            entry[0] = refresh
+            self.metrics["coalesced"] += 1
+            return
+        now = asyncio.get_running_loop().time()
+        due = max(now, self.last_run.get(key, now - self.interval) + self.interval)
+        self.pending[key] = [refresh, due]
+        self.ready.set()
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self.pending:
+                now = loop.time()
+                self.last_run = {
+                    key: ran_at for key, ran_at in self.last_run.items() if now - ran_at < self.interval
+                }
+                self.ready.clear()
+                await self.ready.wait()
+                continue
+            key = min(self.pending, key=lambda k: self.pending[k][1])
+            delay = self.pending[key][1] - loop.time()
+            if delay > 0:
+                self.ready.clear()
+                try:
+                    await asyncio.wait_for(self.ready.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            refresh, _ = self.pending.pop(key)
+            self.last_run[key] = loop.time()
+            try:
+                await refresh()
+            except Exception:
+                self.metrics["failed"] += 1
+                continue
+            self.metrics["edits"] += 1
 
-    log_channel_id = REPORTS_CHANNEL_ID if action.startswith("report_") else STAFF_LOG_CHANNEL_ID
-    channel = bot.get_channel(log_channel_id)
-    if not channel:
-        return
 
-    parsed_details = {}
-    if detail_text:
-        try:
-            parsed_details = json.loads(detail_text)
-        except json.JSONDecodeError:
-            parsed_details = {}
+message_updater = MessageUpdater(MESSAGE_UPDATE_INTERVAL_SECONDS)
+
+
+@dataclass
+class LogRecord:
+    action: str
+    user_id: Optional[int]
+    details: Dict[str, object]
+    created_at: int
+
+
+def log_channel_id_for(action: str) -> int:
+    return REPORTS_CHANNEL_ID if action.startswith("report_") else STAFF_LOG_CHANNEL_ID
 
+
+def is_digest_record(record: LogRecord) -> bool:
+    return record.action == "entries_gain" and record.details.get("source") in DIGEST_ENTRY_SOURCES
+
+
+def build_log_embed(record: LogRecord) -> discord.Embed:
+    action = record.action
+    user_id = record.user_id
+    details = record.details
+    created_ts = record.created_at
     user_label = f"<@{user_id}>" if user_id else "Unknown"
     embed = None
 
@@ -673,65 +1669,257 @@ async def log_event(action: str, user_id: Optional[int], details: str):
         title = f"{EMOJI['staff_hammer']} {EMOJI['moonlight']} Automod Entry Ban"
         embed = discord.Embed(title=title, color=discord.Color.dark_red())
         embed.add_field(name="User", value=f"{user_label} ({user_id})" if user_id else "Unknown", inline=False)
-        embed.add_field(name="Reason", value=parsed_details.get("reason", "Unknown"), inline=True)
+        embed.add_field(name="Reason", value=details.get("reason", "Unknown"), inline=True)
         embed.add_field(name="Entry ban duration", value="120s", inline=True)
-        cooldown_ts = parsed_details.get("no_entry_until", created_ts)
+        cooldown_ts = details.get("no_entry_until", created_ts)
         embed.add_field(name="Ends", value=f"<t:{cooldown_ts}:R>", inline=True)
     elif action == "automod_punishment":
         title = f"{EMOJI['staff_hammer']} {EMOJI['moonlight']} Automod Punishment"
         embed = discord.Embed(title=title, color=discord.Color.dark_red())
         embed.add_field(name="User", value=f"{user_label} ({user_id})" if user_id else "Unknown", inline=False)
-        embed.add_field(name="Reason", value=parsed_details.get("reason", "Unknown"), inline=True)
-        embed.add_field(name="Channel", value=str(parsed_details.get("channel_id", "Unknown")), inline=True)
-        embed.add_field(name="Message Content", value=parsed_details.get("content", "Unknown"), inline=False)
-        cooldown_ts = parsed_details.get("no_entry_until", created_ts)
+        embed.add_field(name="Reason", value=details.get("reason", "Unknown"), inline=True)
+        embed.add_field(name="Channel", value=str(details.get("channel_id", "Unknown")), inline=True)
+        embed.add_field(name="Message Content", value=details.get("content", "Unknown"), inline=False)
+        cooldown_ts = details.get("no_entry_until", created_ts)
         embed.add_field(name="No-Entry Cooldown Ends", value=f"<t:{cooldown_ts}:R>", inline=False)
     elif action == "entries_gain":
         title = f"{EMOJI['star']} {EMOJI['heart']} Entries Gained"
         embed = discord.Embed(title=title, color=discord.Color.teal())
         embed.add_field(name="User", value=f"{user_label} ({user_id})" if user_id else "Unknown", inline=False)
-        embed.add_field(name="Source", value=str(parsed_details.get("source", "Unknown")), inline=True)
-        embed.add_field(name="Amount Gained", value=str(parsed_details.get("amount", "0")), inline=True)
-        embed.add_field(name="Balance After", value=str(parsed_details.get("new_balance", "Unknown")), inline=True)
+        embed.add_field(name="Source", value=str(details.get("source", "Unknown")), inline=True)
+        embed.add_field(name="Amount Gained", value=str(details.get("amount", "0")), inline=True)
+        embed.add_field(name="Balance After", value=str(details.get("new_balance", "Unknown")), inline=True)
         embed.add_field(name="Time", value=f"<t:{created_ts}:R>", inline=False)
     elif action == "invite_entries_granted":
         title = f"{EMOJI['star']} {EMOJI['moonlight']} Invite Entries Granted"
         embed = discord.Embed(title=title, color=discord.Color.green())
         embed.add_field(name="User", value=f"{user_label} ({user_id})" if user_id else "Unknown", inline=False)
-        embed.add_field(name="Tier", value=str(parsed_details.get("tier", "Unknown")), inline=True)
-        embed.add_field(name="Entries Granted", value=str(parsed_details.get("entries_granted", "0")), inline=True)
+        embed.add_field(name="Tier", value=str(details.get("tier", "Unknown")), inline=True)
+        embed.add_field(name="Entries Granted", value=str(details.get("entries_granted", "0")), inline=True)
         embed.add_field(
             name="Remaining Stock",
-            value=str(parsed_details.get("remaining_stock", "Unknown")),
+            value=str(details.get("remaining_stock", "Unknown")),
             inline=True,
         )
         embed.add_field(
             name="Valid Invites",
-            value=str(parsed_details.get("valid_invites", "Unknown")),
+            value=str(details.get("valid_invites", "Unknown")),
             inline=True,
         )
-        embed.add_field(name="Time", value=f"<t:{created_ts}:R>", inline=False)
-    elif action == "admin_bypass":
-        title = f"{EMOJI['moonlight']} Admin Bypass Notice"
-        embed = discord.Embed(title=title, color=discord.Color.dark_grey())
-        embed.add_field(name="User", value=f"{user_label} ({user_id})" if user_id else "Unknown", inline=False)
-        embed.add_field(name="Reason", value=parsed_details.get("reason", "Unknown"), inline=True)
-        embed.add_field(name="Channel", value=str(parsed_details.get("channel_id", "Unknown")), inline=True)
-        embed.add_field(name="Message Content", value=parsed_details.get("content", "Unknown"), inline=False)
-        embed.add_field(name="Time", value=f"<t:{created_ts}:R>", inline=False)
-    else:
-        title = "Staff Log"
-        embed = discord.Embed(title=title, color=discord.Color.dark_grey())
-        embed.add_field(name="User", value=f"{user_label} ({user_id})" if user_id else "Unknown", inline=False)
-        embed.add_field(name="Action", value=action, inline=True)
-        embed.add_field(name="Details", value=detail_text or "None", inline=False)
-        embed.add_field(name="Time", value=f"<t:{created_ts}:R>", inline=False)
+        embed.add_field(name="Time", value=f"<t:{created_ts}:R>", inline=False)
+    elif action == "admin_bypass":
+        title = f"{EMOJI['moonlight']} Admin Bypass Notice"
+        embed = discord.Embed(title=title, color=discord.Color.dark_grey())
+        embed.add_field(name="User", value=f"{user_label} ({user_id})" if user_id else "Unknown", inline=False)
+        embed.add_field(name="Reason", value=details.get("reason", "Unknown"), inline=True)
+        embed.add_field(name="Channel", value=str(details.get("channel_id", "Unknown")), inline=True)
+        embed.add_field(name="Message Content", value=details.get("content", "Unknown"), inline=False)
+        embed.add_field(name="Time", value=f"<t:{created_ts}:R>", inline=False)
+    elif action == "report_submitted":
+        title = f"{EMOJI['staff_hammer']} Report Submitted"
+        embed = discord.Embed(title=title, color=discord.Color.red())
+        embed.add_field(name="Reporter", value=f"{user_label} ({user_id})" if user_id else "Unknown", inline=False)
+        embed.add_field(name="Reported ID", value=str(details.get("reported_id", "Unknown")), inline=True)
+        embed.add_field(name="Reason", value=str(details.get("reason", "Unknown"))[:1024], inline=False)
+        embed.add_field(name="Time", value=f"<t:{created_ts}:R>", inline=False)
+    else:
+        title = "Staff Log"
+        embed = discord.Embed(title=title, color=discord.Color.dark_grey())
+        embed.add_field(name="User", value=f"{user_label} ({user_id})" if user_id else "Unknown", inline=False)
+        embed.add_field(name="Action", value=action, inline=True)
+        detail_text = "\n".join(f"{key}: {value}" for key, value in details.items())
+        embed.add_field(name="Details", value=detail_text[:1024] or "None", inline=False)
+        embed.add_field(name="Time", value=f"<t:{created_ts}:R>", inline=False)
+
+    embed.set_footer(text=f"Timestamp: <t:{created_ts}:F>")
+    return embed
+
+
+async def copy_log_records(conn, records: List[LogRecord]):
+    await conn.copy_records_to_table(
+        "logs",
+        records=[
+            (record.user_id, record.action, json.dumps(record.details, default=str), record.created_at)
+            for record in records
+        ],
+        columns=["user_id", "action", "details", "created_at"],
+    )
+
+
+def chunk_embeds(embeds: List[discord.Embed]) -> List[List[discord.Embed]]:
+    groups: List[List[discord.Embed]] = []
+    size = 0
+    for embed in embeds:
+        if groups and len(groups[-1]) < EMBEDS_PER_MESSAGE and size + len(embed) <= EMBED_MESSAGE_CHAR_LIMIT:
+            groups[-1].append(embed)
+            size += len(embed)
+        else:
+            groups.append([embed])
+            size = len(embed)
+    return groups
+
+
+class LogSink:
+    def __init__(self, max_rows: int, max_embeds: int, flush_interval_ms: int):
+        self.rows: asyncio.Queue = asyncio.Queue(maxsize=max_rows)
+        self.embeds: asyncio.Queue = asyncio.Queue(maxsize=max_embeds)
+        self.priority: asyncio.Queue = asyncio.Queue(maxsize=max_embeds)
+        self.embed_ready = asyncio.Event()
+        self.flush_interval = max(0.05, flush_interval_ms / 1000)
+        self.holding: Optional[LogRecord] = None
+        self.sent_at: Dict[int, deque] = {}
+        self.digest: Dict[int, List[int]] = {}
+        self.metrics = {
+            "rows_written": 0,
+            "rows_dropped": 0,
+            "embeds_sent": 0,
+            "embeds_dropped": 0,
+            "messages_sent": 0,
+            "digested": 0,
+        }
+
+    def submit(self, record: LogRecord):
+        try:
+            self.rows.put_nowait(record)
+        except asyncio.QueueFull:
+            self.metrics["rows_dropped"] += 1
+        if is_digest_record(record):
+            self.add_to_digest(record)
+            return
+        lane = self.priority if record.action in PRIORITY_LOG_ACTIONS else self.embeds
+        self.enqueue_embed(lane, log_channel_id_for(record.action), record)
+
+    def enqueue_embed(self, lane: asyncio.Queue, channel_id: int, item):
+        try:
+            lane.put_nowait((channel_id, item))
+        except asyncio.QueueFull:
+            self.metrics["embeds_dropped"] += 1
+            return
+        self.embed_ready.set()
+
+    def add_to_digest(self, record: LogRecord):
+        totals = self.digest.setdefault(record.user_id or 0, [0, 0, 0])
+        totals[0] += 1
+        totals[1] += int(record.details.get("amount", 0) or 0)
+        totals[2] = int(record.details.get("new_balance", totals[2]) or 0)
+        self.metrics["digested"] += 1
+
+    def flush_digest(self):
+        if not self.digest:
+            return
+        digest, self.digest = self.digest, {}
+        drops = sum(totals[0] for totals in digest.values())
+        gained = sum(totals[1] for totals in digest.values())
+        ordered = sorted(digest.items(), key=lambda item: item[1][1], reverse=True)
+        lines = [
+            f"<@{uid}> — **+{gained_:,}** ({count} drop{'s' if count != 1 else ''}) • balance **{balance:,}**"
+            for uid, (count, gained_, balance) in ordered
+        ]
+        header = (
+            f"**{drops:,}** drops • **{gained:,}** entries • **{len(digest):,}** users "
+            f"in the last {LOG_DIGEST_INTERVAL_SECONDS}s"
+        )
+        created_ts = now_ts()
+        for index, chunk in enumerate(chunk_lines(lines, max_chars=3500)):
+            embed = discord.Embed(
+                title=f"{EMOJI['star']} {EMOJI['heart']} Chat RNG Digest" + (" (cont.)" if index else ""),
+                description=f"{header}\n\n{chunk}" if index == 0 else chunk,
+                color=discord.Color.teal(),
+            )
+            embed.set_footer(text=f"Timestamp: <t:{created_ts}:F>")
+            self.enqueue_embed(self.embeds, STAFF_LOG_CHANNEL_ID, embed)
+
+    async def run_digest(self):
+        while True:
+            await asyncio.sleep(LOG_DIGEST_INTERVAL_SECONDS)
+            self.flush_digest()
+
+    def drain_rows(self, first: Optional[LogRecord] = None) -> List[LogRecord]:
+        batch = [first] if first else []
+        while True:
+            try:
+                batch.append(self.rows.get_nowait())
+            except asyncio.QueueEmpty:
+                return batch
+
+    async def write_rows(self, batch: List[LogRecord]):
+        if not batch:
+            return
+        await copy_log_records(db_pool, batch)
+        self.metrics["rows_written"] += len(batch)
+
+    async def flush(self):
+        first, self.holding = self.holding, None
+        await self.write_rows(self.drain_rows(first))
+
+    async def run_rows(self):
+        while True:
+            self.holding = await self.rows.get()
+            await asyncio.sleep(self.flush_interval)
+            first, self.holding = self.holding, None
+            try:
+                await self.write_rows(self.drain_rows(first))
+            except Exception:
+                await asyncio.sleep(5)
+
+    async def wait_for_send_slot(self, channel_id: int):
+        loop = asyncio.get_running_loop()
+        window = self.sent_at.setdefault(channel_id, deque())
+        while True:
+            now = loop.time()
+            while window and now - window[0] >= STAFF_LOG_RATE_PERIOD:
+                window.popleft()
+            if len(window) < STAFF_LOG_RATE_LIMIT:
+                window.append(now)
+                return
+            await asyncio.sleep(STAFF_LOG_RATE_PERIOD - (now - window[0]))
+
+    async def send_embeds(self, channel_id: int, embeds: List[discord.Embed]):
+        channel = bot.get_channel(channel_id)
+        if not channel:
+            return
+        await self.wait_for_send_slot(channel_id)
+        try:
+            await channel.send(embeds=embeds, allowed_mentions=discord.AllowedMentions.none())
+        except discord.HTTPException as exc:
+            if exc.status == 429:
+                await asyncio.sleep(getattr(exc, "retry_after", None) or STAFF_LOG_RATE_PERIOD)
+            return
+        self.metrics["embeds_sent"] += len(embeds)
+        self.metrics["messages_sent"] += 1
+
+    def take_embeds(self, limit: int) -> Dict[int, List[discord.Embed]]:
+        grouped: Dict[int, List[discord.Embed]] = {}
+        taken = 0
+        for lane in (self.priority, self.embeds):
+            while taken < limit:
+                try:
+                    channel_id, item = lane.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                embed = item if isinstance(item, discord.Embed) else build_log_embed(item)
+                grouped.setdefault(channel_id, []).append(embed)
+                taken += 1
+        return grouped
+
+    async def run_embeds(self):
+        while True:
+            await self.embed_ready.wait()
+            self.embed_ready.clear()
+            while not (self.priority.empty() and self.embeds.empty()):
+                for channel_id, embeds in self.take_embeds(EMBEDS_PER_MESSAGE).items():
+                    for group in chunk_embeds(embeds):
+                        try:
+                            await self.send_embeds(channel_id, group)
+                        except Exception:
+                            continue
 
-    embed.set_footer(text=f"Timestamp: <t:{created_ts}:F>")
-    try:
-        await channel.send(embed=embed, allowed_mentions=discord.AllowedMentions.none())
-    except Exception:
-        return
+
+log_sink = LogSink(LOG_QUEUE_MAX, LOG_EMBED_QUEUE_MAX, LOG_FLUSH_INTERVAL_MS)
+
+
+def log_event(action: str, user_id: Optional[int], details: Optional[Dict[str, object]] = None):
+    log_sink.submit(LogRecord(action=action, user_id=user_id, details=details or {}, created_at=now_ts()))
 
 
 def get_custom_status_text(member: discord.Member) -> Optional[str]:
@@ -874,8 +2062,8 @@ class BankView(discord.ui.View):
     )
     async def view_entries(self, interaction: discord.Interaction, button: discord.ui.Button):
         user = interaction.user
-        data = await get_or_create_user(user.id)
-        description = f"Balance: **{data['entries']:,}** entries {EMOJI['star']}"
+        balance = await balance_cache.get(user.id)
+        description = f"Balance: **{balance:,}** entries {EMOJI['star']}"
         embed = build_embed(
             "bank",
             f"{EMOJI['star']} {EMOJI['heart']} Bank Entries",
@@ -885,6 +2073,22 @@ class BankView(discord.ui.View):
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
 
+def roll_dice_faces(amount: int) -> List[int]:
+    if numpy is not None:
+        return [int(count) for count in numpy.random.default_rng().multinomial(amount, [1 / 6] * 6)]
+    counts = [0] * 6
+    remaining = amount
+    while remaining:
+        tallies = Counter(random.randbytes(remaining))
+        remaining = 0
+        for value, hits in tallies.items():
+            if value < 252:
+                counts[value % 6] += hits
+            else:
+                remaining += hits
+    return counts
+
+
 class DiceRollModal(discord.ui.Modal):
     def __init__(self):
         super().__init__(title="🎲 Dice Roll")
@@ -907,55 +2111,44 @@ class DiceRollModal(discord.ui.Modal):
                 ephemeral=True,
             )
             return
-        if amount < 1 or amount > 100_000:
+        if amount < 1 or amount > DICE_MAX_ROLLS:
             await interaction.response.send_message(
-                f"{EMOJI['moonlight']} Enter between 1 and 100000 entries.",
+                f"{EMOJI['moonlight']} Enter between 1 and {DICE_MAX_ROLLS} entries.",
                 ephemeral=True,
             )
             return
-        async with db_pool.acquire() as conn:
-            async with conn.transaction():
-                await ensure_user(conn, user.id)
-                row = await conn.fetchrow(
-                    "SELECT entries FROM users WHERE user_id=$1 FOR UPDATE",
-                    user.id,
-                )
-                balance = int(row["entries"])
-                if balance < amount:
-                    await interaction.response.send_message(
-                        f"{EMOJI['moonlight']} You don't have enough entries.",
-                        ephemeral=True,
-                    )
-                    return
-                face_counts = {face: 0 for face in range(1, 7)}
-                net_change = 0
-                for _ in range(amount):
-                    roll = random.randint(1, 6)
-                    face_counts[roll] += 1
-                    if roll <= 3:
-                        net_change -= 1
-                    else:
-                        net_change += 1
-                new_balance = balance + net_change
-                await conn.execute(
-                    "UPDATE users SET entries=$1 WHERE user_id=$2",
-                    new_balance,
-                    user.id,
-                )
+        counts = await asyncio.to_thread(roll_dice_faces, amount)
+        face_counts = {face: counts[face - 1] for face in range(1, 7)}
+        net_change = sum(counts[3:]) - sum(counts[:3])
+
+        async def work(conn: asyncpg.Connection) -> WorkResult:
+            change = await entries_ledger.adjust(
+                conn, user.id, net_change, amount, "dice_roll", str(interaction.id)
+            )
+            if not change:
+                return WorkResult(False, "insufficient_entries")
+            return WorkResult(True, values={"new_balance": change.new_balance})
+
+        result = await unit_of_work(work)
+        if not result.ok:
+            await interaction.response.send_message(
+                f"{EMOJI['moonlight']} You don't have enough entries.",
+                ephemeral=True,
+            )
+            return
+        new_balance = result.values["new_balance"]
         if isinstance(user, discord.Member):
-            await update_user_roles(user, new_balance)
-        await log_event(
+            rank_reconciler.schedule(user, new_balance)
+        log_event(
             "entries_gain",
             user.id,
-            json.dumps(
-                {
-                    "source": "dice_roll",
-                    "amount_rolled": amount,
-                    "net_change": net_change,
-                    "new_balance": new_balance,
-                    "channel_id": interaction.channel_id,
-                }
-            ),
+            {
+                "source": "dice_roll",
+                "amount_rolled": amount,
+                "net_change": net_change,
+                "new_balance": new_balance,
+                "channel_id": interaction.channel_id,
+            },
         )
         description = (
             f"Rolls: **{amount:,}**\n"
@@ -1028,52 +2221,76 @@ class GiveawayEntryModal(discord.ui.Modal):
                 f"{EMOJI['moonlight']} Invalid entry amount.",
                 ephemeral=True,
             )
-            await log_event("economy_abuse", user.id, "Non-integer giveaway entry attempt.")
+            log_event("economy_abuse", user.id, {"reason": "non_integer_entry", "giveaway_id": self.giveaway_id})
             return
         if amount <= 0 or amount > 10_000_000:
             await interaction.response.send_message(
                 f"{EMOJI['moonlight']} Invalid entry amount.",
                 ephemeral=True,
             )
-            await log_event("economy_abuse", user.id, f"Invalid giveaway entry amount: {amount}.")
+            log_event(
+                "economy_abuse",
+                user.id,
+                {"reason": "invalid_entry_amount", "giveaway_id": self.giveaway_id, "amount": amount},
+            )
             return
-        async with db_pool.acquire() as conn:
-            async with conn.transaction():
-                await ensure_user(conn, user.id)
-                row = await conn.fetchrow(
-                    "SELECT entries FROM users WHERE user_id=$1 FOR UPDATE",
-                    user.id,
-                )
-                balance = int(row["entries"])
-                if balance < amount:
-                    await interaction.response.send_message(
-                        f"{EMOJI['moonlight']} You don't have enough entries.",
-                        ephemeral=True,
-                    )
-                    return
-                await conn.execute(
-                    "UPDATE users SET entries=entries-$1 WHERE user_id=$2",
-                    amount,
-                    user.id,
-                )
-                entry_row = await conn.fetchrow(
-                    """
-                    INSERT INTO giveaway_entries (giveaway_id, user_id, entries_spent, entered_at)
-                    VALUES ($1, $2, $3, $4)
-                    ON CONFLICT (giveaway_id, user_id)
-                    DO UPDATE SET entries_spent=giveaway_entries.entries_spent + EXCLUDED.entries_spent,
-                                  entered_at=EXCLUDED.entered_at
-                    RETURNING entries_spent
-                    """,
-                    self.giveaway_id,
-                    user.id,
-                    amount,
-                    now_ts(),
-                )
-                new_balance = balance - amount
+        giveaway_id = self.giveaway_id
+
+        async def work(conn: asyncpg.Connection) -> WorkResult:
+            still_open = await conn.fetchval(HOT_QUERIES["lock_open_giveaway"], giveaway_id)
+            if not still_open:
+                return WorkResult(False, "giveaway_ended")
+            change = await entries_ledger.debit(conn, user.id, amount, "giveaway_entry", str(giveaway_id))
+            if not change:
+                return WorkResult(False, "insufficient_entries")
+            entry_row = await conn.fetchrow(
+                """
+                INSERT INTO giveaway_entries (giveaway_id, user_id, entries_spent, entered_at)
+                VALUES ($1, $2, $3, $4)
+                ON CONFLICT (giveaway_id, user_id)
+                DO UPDATE SET entries_spent=giveaway_entries.entries_spent + EXCLUDED.entries_spent,
+                              entered_at=EXCLUDED.entered_at
+                RETURNING entries_spent, (xmax = 0) AS inserted
+                """,
+                giveaway_id,
+                user.id,
+                amount,
+                now_ts(),
+            )
+            await conn.execute(
+                """
+                UPDATE giveaways
+                SET total_entries=total_entries+$2, entrant_count=entrant_count+$3
+                WHERE id=$1
+                """,
+                giveaway_id,
+                amount,
+                1 if entry_row["inserted"] else 0,
+            )
+            return WorkResult(
+                True,
+                values={"new_balance": change.new_balance, "total_entries": entry_row["entries_spent"]},
+            )
+
+        result = await unit_of_work(work)
+        if result.reason == "giveaway_ended":
+            await interaction.response.send_message(
+                f"{EMOJI['moonlight']} This giveaway has ended.",
+                ephemeral=True,
+            )
+            return
+        if not result.ok:
+            await interaction.response.send_message(
+                f"{EMOJI['moonlight']} You don't have enough entries.",
+                ephemeral=True,
+            )
+            return
+        new_balance = result.values["new_balance"]
+        invalidate_entrants_cache(self.giveaway_id)
+        mark_giveaway_dirty(self.giveaway_id)
         if isinstance(user, discord.Member):
-            await update_user_roles(user, new_balance)
-        total_entries = entry_row["entries_spent"] if entry_row else amount
+            rank_reconciler.schedule(user, new_balance)
+        total_entries = result.values["total_entries"]
         await interaction.response.send_message(
             f"{EMOJI['star']} Entry recorded! Total in giveaway: **{total_entries:,}**.",
             ephemeral=True,
@@ -1114,54 +2331,50 @@ class GiveawayView(discord.ui.View):
         await interaction.response.send_modal(GiveawayEntryModal(self.giveaway_id))
 
     async def view_entrants(self, interaction: discord.Interaction):
-        header, chunks = await build_giveaway_entrants_output(interaction, self.giveaway_id)
-        giveaway = await db_pool.fetchrow(
-            "SELECT prize, is_big FROM giveaways WHERE id=$1",
-            self.giveaway_id,
-        )
-        kind = "giveaway_big" if (giveaway and giveaway["is_big"]) else "giveaway_normal"
-
-        if not chunks:
-            embed = build_embed(
-                kind,
-                "👻 Giveaway Entrants",
-                header,
-                [],
-                include_banner=False,
-            )
+        embed, page, page_count = await render_entrants_page(interaction.guild, self.giveaway_id, 0)
+        if page_count > 1:
             await interaction.response.send_message(
                 embed=embed,
+                view=EntrantsPageView(self.giveaway_id, page, page_count),
                 ephemeral=True,
                 allowed_mentions=discord.AllowedMentions.none(),
             )
             return
-
-        first_embed = build_embed(
-            kind,
-            "👻 Giveaway Entrants",
-            f"{header}\n\n{chunks[0]}",
-            [],
-            include_banner=False,
-        )
         await interaction.response.send_message(
-            embed=first_embed,
+            embed=embed,
             ephemeral=True,
             allowed_mentions=discord.AllowedMentions.none(),
         )
 
-        for chunk in chunks[1:]:
-            embed = build_embed(
-                kind,
-                "👻 Giveaway Entrants (cont.)",
-                chunk,
-                [],
-                include_banner=False,
-            )
-            await interaction.followup.send(
-                embed=embed,
-                ephemeral=True,
-                allowed_mentions=discord.AllowedMentions.none(),
-            )
+
+class EntrantsPageView(discord.ui.View):
+    def __init__(self, giveaway_id: int, page: int, page_count: int):
+        super().__init__(timeout=300)
+        self.giveaway_id = giveaway_id
+        self.page = page
+        self.page_count = page_count
+        self.sync_buttons()
+
+    def sync_buttons(self):
+        self.previous_page.disabled = self.page <= 0
+        self.next_page.disabled = self.page >= self.page_count - 1
+
+    async def show(self, interaction: discord.Interaction, page: int):
+        embed, self.page, self.page_count = await render_entrants_page(interaction.guild, self.giveaway_id, page)
+        self.sync_buttons()
+        await interaction.response.edit_message(
+            embed=embed,
+            view=self,
+            allowed_mentions=discord.AllowedMentions.none(),
+        )
+
+    @discord.ui.button(label="Previous", style=discord.ButtonStyle.secondary, emoji="◀️")
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.show(interaction, self.page - 1)
+
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.secondary, emoji="▶️")
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.show(interaction, self.page + 1)
 
 
 class InvitesPanelView(discord.ui.View):
@@ -1197,15 +2410,13 @@ class InvitesPanelView(discord.ui.View):
                 now,
                 older_codes,
             )
-            await log_event(
+            log_event(
                 "invite_code_multiple_active",
                 interaction.user.id,
-                json.dumps(
-                    {
-                        "kept_code": active_row["code"],
-                        "expired_codes": older_codes,
-                    }
-                ),
+                {
+                    "kept_code": active_row["code"],
+                    "expired_codes": older_codes,
+                },
             )
         if active_row:
             invite_exists = True
@@ -1215,16 +2426,14 @@ class InvitesPanelView(discord.ui.View):
             except (discord.Forbidden, discord.HTTPException):
                 invite_exists = True
             if invite_exists:
-                await log_event(
+                log_event(
                     "invite_code_reused",
                     interaction.user.id,
-                    json.dumps(
-                        {
-                            "code": active_row["code"],
-                            "invite_id": active_row["invite_id"],
-                            "expires_at": active_row["expires_at"],
-                        }
-                    ),
+                    {
+                        "code": active_row["code"],
+                        "invite_id": active_row["invite_id"],
+                        "expires_at": active_row["expires_at"],
+                    },
                 )
                 description = (
                     f"Invite URL: {active_row['invite_url']}\n"
@@ -1248,16 +2457,14 @@ class InvitesPanelView(discord.ui.View):
                 now,
                 active_row["code"],
             )
-            await log_event(
+            log_event(
                 "invite_code_deleted",
                 interaction.user.id,
-                json.dumps(
-                    {
-                        "code": active_row["code"],
-                        "invite_id": active_row["invite_id"],
-                        "expires_at": active_row["expires_at"],
-                    }
-                ),
+                {
+                    "code": active_row["code"],
+                    "invite_id": active_row["invite_id"],
+                    "expires_at": active_row["expires_at"],
+                },
             )
         code = await generate_invite_code()
         expires_at = now + 7 * 86400
@@ -1293,16 +2500,14 @@ class InvitesPanelView(discord.ui.View):
             now,
             expires_at,
         )
-        await log_event(
+        log_event(
             "invite_code_created",
             interaction.user.id,
-            json.dumps(
-                {
-                    "code": code,
-                    "invite_id": invite.code,
-                    "expires_at": expires_at,
-                }
-            ),
+            {
+                "code": code,
+                "invite_id": invite.code,
+                "expires_at": expires_at,
+            },
         )
         description = f"Invite URL: {invite.url}\nExpires: <t:{expires_at}:R>\nEvent Ends: <t:{event_state.ends_at}:R>"
         embed = build_embed(
@@ -1419,10 +2624,7 @@ class SupportPanelView(discord.ui.View):
         guild = interaction.guild
         if not guild:
             return
-        open_count = await db_pool.fetchval(
-            "SELECT COUNT(*) FROM tickets WHERE opener_id=$1 AND open=true",
-            interaction.user.id,
-        )
+        open_count = await db_pool.fetchval_hot("open_ticket_count", interaction.user.id)
         limit = 2 if has_booster_role(interaction.user if isinstance(interaction.user, discord.Member) else None) else 1
         if open_count >= limit:
             await interaction.response.send_message(
@@ -1454,7 +2656,7 @@ class SupportPanelView(discord.ui.View):
             f"{EMOJI['moonlight']} Ticket created: {channel.mention}",
             ephemeral=True,
         )
-        await log_event("ticket_created", interaction.user.id, f"Ticket channel {channel.id}")
+        log_event("ticket_created", interaction.user.id, {"channel_id": channel.id})
 
     @discord.ui.button(
         label="Trade",
@@ -1492,10 +2694,7 @@ class ScriptPanelView(discord.ui.View):
         guild = interaction.guild
         if not guild:
             return
-        open_count = await db_pool.fetchval(
-            "SELECT COUNT(*) FROM tickets WHERE opener_id=$1 AND open=true",
-            interaction.user.id,
-        )
+        open_count = await db_pool.fetchval_hot("open_ticket_count", interaction.user.id)
         limit = 2 if has_booster_role(interaction.user if isinstance(interaction.user, discord.Member) else None) else 1
         if open_count >= limit:
             await interaction.response.send_message(
@@ -1534,7 +2733,7 @@ class ScriptPanelView(discord.ui.View):
             f"Ticket created: {channel.mention}",
             ephemeral=True,
         )
-        await log_event("script_ticket_created", interaction.user.id, f"Script ticket channel {channel.id}")
+        log_event("script_ticket_created", interaction.user.id, {"channel_id": channel.id})
 
 
 class ReportModal(discord.ui.Modal):
@@ -1558,10 +2757,10 @@ class ReportModal(discord.ui.Modal):
     async def on_submit(self, interaction: discord.Interaction):
         reported_id = self.reported_user.value.strip()
         reason = self.reason.value.strip()
-        await log_event(
+        log_event(
             "report_submitted",
             interaction.user.id,
-            f"Reported ID: {reported_id} | Reason: {reason}",
+            {"reported_id": reported_id, "reason": reason},
         )
         await interaction.response.send_message(
             f"{EMOJI['staff_hammer']} Your report was submitted.",
@@ -1595,7 +2794,7 @@ class TicketCloseView(discord.ui.View):
             self.channel_id,
         )
         await interaction.response.send_message("Ticket will close in 10 seconds.")
-        await log_event("ticket_closed", interaction.user.id, f"Ticket channel {self.channel_id}")
+        log_event("ticket_closed", interaction.user.id, {"channel_id": self.channel_id})
         await asyncio.sleep(10)
         try:
             await interaction.channel.delete(reason="Ticket closed")
@@ -1620,52 +2819,60 @@ async def handle_invite_purchase(interaction: discord.Interaction, user_id: int,
         return
     event_state = await get_event_state()
     stock_key = f"stock_{needed_invites}"
-    async with db_pool.acquire() as conn:
-        async with conn.transaction():
-            state_row = await conn.fetchrow(
-                "SELECT ends_at, stock_3, stock_5, stock_10 FROM invite_event_state WHERE key='global' FOR UPDATE"
-            )
-            stock_value = int(state_row[stock_key])
-            if stock_value <= 0:
-                embed = build_embed(
-                    "invite",
-                    f"{EMOJI['moonlight']} Out of Stock",
-                    "Try again after the next reset.",
-                    [("Resets", f"<t:{state_row['ends_at']}:R>", True)],
-                )
-                await interaction.response.send_message(embed=embed, ephemeral=True)
-                return
-            row = await conn.fetchrow(
-                """
-                SELECT SUM(valid) AS valid_count
-                FROM invite_joins
-                WHERE inviter_id=$1 AND joined_at >= $2 AND valid=true
-                """,
-                user_id,
-                event_state.last_reset,
-            )
-            valid_invites = int(row["valid_count"] or 0)
-            if valid_invites < needed_invites:
-                await interaction.response.send_message(
-                    f"{EMOJI['moonlight']} Not enough valid invites.",
-                    ephemeral=True,
-                )
-                return
-            await ensure_user(conn, user_id)
-            row = await conn.fetchrow(
-                "SELECT entries FROM users WHERE user_id=$1 FOR UPDATE",
-                user_id,
-            )
-            old_balance = int(row["entries"])
-            new_balance = old_balance + reward
-            await conn.execute(
-                "UPDATE invite_event_state SET {0}={0}-1 WHERE key='global'".format(stock_key)
-            )
-            await conn.execute(
-                "UPDATE users SET entries=$1 WHERE user_id=$2",
-                new_balance,
-                user_id,
-            )
+
+    async def work(conn: asyncpg.Connection) -> WorkResult:
+        state_row = await conn.fetchrow(
+            "SELECT ends_at, stock_3, stock_5, stock_10 FROM invite_event_state WHERE key='global' FOR UPDATE"
+        )
+        stock_value = int(state_row[stock_key])
+        if stock_value <= 0:
+            return WorkResult(False, "out_of_stock", {"resets_at": state_row["ends_at"]})
+        row = await conn.fetchrow(
+            """
+            SELECT COUNT(*) AS valid_count
+            FROM invite_joins
+            WHERE inviter_id=$1 AND joined_at >= $2 AND valid=true
+            """,
+            user_id,
+            event_state.last_reset,
+        )
+        valid_invites = int(row["valid_count"] or 0)
+        if valid_invites < needed_invites:
+            return WorkResult(False, "not_enough_invites")
+        await conn.execute(
+            "UPDATE invite_event_state SET {0}={0}-1 WHERE key='global'".format(stock_key)
+        )
+        change = await entries_ledger.credit(conn, user_id, reward, "invite_reward", str(needed_invites))
+        return WorkResult(
+            True,
+            values={
+                "stock_value": stock_value,
+                "valid_invites": valid_invites,
+                "old_balance": change.old_balance,
+                "new_balance": change.new_balance,
+            },
+        )
+
+    result = await unit_of_work(work)
+    if result.reason == "out_of_stock":
+        embed = build_embed(
+            "invite",
+            f"{EMOJI['moonlight']} Out of Stock",
+            "Try again after the next reset.",
+            [("Resets", f"<t:{result.values['resets_at']}:R>", True)],
+        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+        return
+    if not result.ok:
+        await interaction.response.send_message(
+            f"{EMOJI['moonlight']} Not enough valid invites.",
+            ephemeral=True,
+        )
+        return
+    stock_value = result.values["stock_value"]
+    valid_invites = result.values["valid_invites"]
+    old_balance = result.values["old_balance"]
+    new_balance = result.values["new_balance"]
     embed = build_embed(
         "invite",
         f"{EMOJI['star']} Purchase Complete",
@@ -1674,32 +2881,28 @@ async def handle_invite_purchase(interaction: discord.Interaction, user_id: int,
     )
     await interaction.response.send_message(embed=embed, ephemeral=True)
     if isinstance(interaction.user, discord.Member):
-        await update_user_roles(interaction.user, new_balance)
-    await log_event(
+        rank_reconciler.schedule(interaction.user, new_balance)
+    log_event(
         "entries_gain",
         user_id,
-        json.dumps(
-            {
-                "source": "invite_reward",
-                "amount": reward,
-                "old_balance": old_balance,
-                "new_balance": new_balance,
-                "channel_id": interaction.channel_id,
-                "tier": needed_invites,
-            }
-        ),
+        {
+            "source": "invite_reward",
+            "amount": reward,
+            "old_balance": old_balance,
+            "new_balance": new_balance,
+            "channel_id": interaction.channel_id,
+            "tier": needed_invites,
+        },
     )
-    await log_event(
+    log_event(
         "invite_entries_granted",
         user_id,
-        json.dumps(
-            {
-                "tier": needed_invites,
-                "entries_granted": reward,
-                "remaining_stock": max(0, stock_value - 1),
-                "valid_invites": valid_invites,
-            }
-        ),
+        {
+            "tier": needed_invites,
+            "entries_granted": reward,
+            "remaining_stock": max(0, stock_value - 1),
+            "valid_invites": valid_invites,
+        },
     )
 
 
@@ -1839,83 +3042,220 @@ async def refresh_invites_panel():
     await create_invites_panel(channel, event_state)
 
 
-async def daily_role_payout():
-    while True:
-        now_local = berlin_now()
-        target = next_daily_time(21, 0)
-        await asyncio.sleep((target - now_local).total_seconds())
+def compute_daily_payout(member: discord.Member, daily_messages: int) -> Tuple[int, Optional[str], int]:
+    role_reward = 0
+    role_name = None
+    if daily_messages >= DAILY_PAYOUT_MIN_MESSAGES:
+        highest = rank_index.highest_held(member)
+        if highest and highest[4] > 0:
+            role_reward = highest[4]
+            role_name = highest[1]
+    booster_reward = DAILY_BOOSTER_REWARD if has_booster_role(member) else 0
+    return role_reward, role_name, booster_reward
 
-        guild = bot.guilds[0] if bot.guilds else None
-        if not guild:
-            continue
 
-        async with db_pool.acquire() as conn:
-            users = await conn.fetch(
-                "SELECT user_id, daily_messages, entries FROM users"
+async def plan_daily_payout(guild: discord.Guild, payout_date: date):
+    await message_ingest.flush()
+    booster_role = guild.get_role(BOOSTER_ROLE_ID)
+    booster_ids = [member.id for member in booster_role.members] if booster_role else []
+    async with db_pool.acquire() as conn:
+        async with conn.transaction():
+            created = await conn.fetchval(
+                """
+                INSERT INTO payout_runs (payout_date, status, created_at)
+                VALUES ($1, 'pending', $2)
+                ON CONFLICT (payout_date) DO NOTHING
+                RETURNING payout_date
+                """,
+                payout_date,
+                now_ts(),
             )
-
-            for user in users:
-                member = guild.get_member(user["user_id"])
+            if not created:
+                return
+            rows = await conn.fetch(
+                """
+                SELECT user_id, daily_messages
+                FROM users
+                WHERE daily_messages >= $1 OR user_id = ANY($2::bigint[])
+                """,
+                DAILY_PAYOUT_MIN_MESSAGES,
+                booster_ids,
+            )
+            items = []
+            for row in rows:
+                member = guild.get_member(row["user_id"])
                 if not member:
                     continue
-                balance = int(user["entries"])
-                reward_applied = False
-                if user["daily_messages"] < 50:
-                    pass
-                else:
-                    highest = None
-                    for rank in RANKS:
-                        if member.get_role(rank[2]):
-                            highest = rank
-
-                    if highest:
-                        reward = highest[4]
-                        if reward > 0:
-                            balance += reward
-                            reward_applied = True
-                            await conn.execute(
-                                "UPDATE users SET entries = entries + $1 WHERE user_id=$2",
-                                reward,
-                                user["user_id"],
-                            )
-                            await log_event(
-                                "entries_gain",
-                                user["user_id"],
-                                json.dumps(
-                                    {
-                                        "source": "daily_role_reward",
-                                        "amount": reward,
-                                        "role": highest[1],
-                                        "new_balance": balance,
-                                    }
-                                ),
-                            )
-
-                if has_booster_role(member):
-                    booster_reward = 15
-                    balance += booster_reward
-                    reward_applied = True
-                    await conn.execute(
-                        "UPDATE users SET entries = entries + $1 WHERE user_id=$2",
-                        booster_reward,
-                        user["user_id"],
+                role_reward, role_name, booster_reward = compute_daily_payout(member, row["daily_messages"])
+                if role_reward or booster_reward:
+                    items.append((payout_date, row["user_id"], role_reward, role_name, booster_reward))
+            if items:
+                await conn.copy_records_to_table(
+                    "payout_items",
+                    records=items,
+                    columns=["payout_date", "user_id", "role_reward", "role_name", "booster_reward"],
+                )
+            await conn.execute(
+                "UPDATE payout_runs SET users_total=$1 WHERE payout_date=$2",
+                len(items),
+                payout_date,
+            )
+            await conn.execute("UPDATE users SET daily_messages = 0")
+
+
+async def pay_payout_chunk(guild: discord.Guild, payout_date: date) -> int:
+    created_ts = now_ts()
+    async with db_pool.acquire() as conn:
+        async with conn.transaction():
+            rows = await conn.fetch(
+                """
+                WITH batch AS (
+                    SELECT user_id
+                    FROM payout_items
+                    WHERE payout_date=$1 AND paid=false
+                    ORDER BY user_id
+                    LIMIT $2
+                    FOR UPDATE SKIP LOCKED
+                ), marked AS (
+                    UPDATE payout_items AS i
+                    SET paid=true
+                    FROM batch
+                    WHERE i.payout_date=$1 AND i.user_id=batch.user_id
+                    RETURNING i.user_id, i.role_reward, i.role_name, i.booster_reward
+                ), credited AS (
+                    UPDATE users AS u
+                    SET entries = u.entries + marked.role_reward + marked.booster_reward
+                    FROM marked
+                    WHERE u.user_id = marked.user_id
+                    RETURNING u.user_id, u.entries
+                ), recorded AS (
+                    INSERT INTO entries_ledger (user_id, delta, source, ref_id, ts)
+                    SELECT m.user_id, m.role_reward, 'daily_role_reward', $3::text, $4::bigint
+                    FROM marked m JOIN credited c ON c.user_id = m.user_id
+                    WHERE m.role_reward <> 0
+                    UNION ALL
+                    SELECT m.user_id, m.booster_reward, 'daily_booster_reward', $3::text, $4::bigint
+                    FROM marked m JOIN credited c ON c.user_id = m.user_id
+                    WHERE m.booster_reward <> 0
+                )
+                SELECT marked.user_id, marked.role_reward, marked.role_name, marked.booster_reward, credited.entries
+                FROM marked
+                JOIN credited ON credited.user_id = marked.user_id
+                """,
+                payout_date,
+                PAYOUT_CHUNK_SIZE,
+                payout_date.isoformat(),
+                created_ts,
+            )
+            records = []
+            for row in rows:
+                balance = int(row["entries"])
+                if row["role_reward"]:
+                    records.append(
+                        LogRecord(
+                            action="entries_gain",
+                            user_id=row["user_id"],
+                            details={
+                                "source": "daily_role_reward",
+                                "amount": row["role_reward"],
+                                "role": row["role_name"],
+                                "new_balance": balance - row["booster_reward"],
+                                "payout_date": payout_date.isoformat(),
+                            },
+                            created_at=created_ts,
+                        )
                     )
-                    await log_event(
-                        "entries_gain",
-                        user["user_id"],
-                        json.dumps(
-                            {
+                if row["booster_reward"]:
+                    records.append(
+                        LogRecord(
+                            action="entries_gain",
+                            user_id=row["user_id"],
+                            details={
                                 "source": "daily_booster_reward",
-                                "amount": booster_reward,
+                                "amount": row["booster_reward"],
                                 "new_balance": balance,
-                            }
-                        ),
+                                "payout_date": payout_date.isoformat(),
+                            },
+                            created_at=created_ts,
+                        )
                     )
+            if records:
+                await copy_log_records(conn, records)
+    for row in rows:
+        balance_cache.put(row["user_id"], int(row["entries"]))
+        member = guild.get_member(row["user_id"])
+        if member:
+            rank_reconciler.schedule(member, int(row["entries"]))
+    return len(rows)
 
-                if reward_applied:
-                    await update_user_roles(member, balance)
 
-            await conn.execute("UPDATE users SET daily_messages = 0")
+async def complete_daily_payout(guild: discord.Guild, payout_date: date):
+    while await pay_payout_chunk(guild, payout_date):
+        pass
+    completed = await db_pool.fetchval(
+        """
+        UPDATE payout_runs
+        SET status='completed', completed_at=$2
+        WHERE payout_date=$1 AND status='pending'
+          AND NOT EXISTS (SELECT 1 FROM payout_items WHERE payout_date=$1 AND paid=false)
+        RETURNING payout_date
+        """,
+        payout_date,
+        now_ts(),
+    )
+    if not completed:
+        return
+    totals = await db_pool.fetchrow(
+        """
+        SELECT COUNT(*) AS users_paid,
+               COALESCE(SUM(role_reward), 0) AS role_entries,
+               COALESCE(SUM(booster_reward), 0) AS booster_entries
+        FROM payout_items
+        WHERE payout_date=$1
+        """,
+        payout_date,
+    )
+    log_event(
+        "daily_payout",
+        None,
+        {
+            "payout_date": payout_date.isoformat(),
+            "users_paid": totals["users_paid"],
+            "role_entries": totals["role_entries"],
+            "booster_entries": totals["booster_entries"],
+        },
+    )
+
+
+async def resume_pending_payouts(guild: discord.Guild):
+    rows = await db_pool.fetch(
+        "SELECT payout_date FROM payout_runs WHERE status='pending' ORDER BY payout_date"
+    )
+    for row in rows:
+        await complete_daily_payout(guild, row["payout_date"])
+
+
+async def daily_role_payout():
+    payout_date: Optional[date] = None
+    backoff = PAYOUT_RETRY_BASE_SECONDS
+    while True:
+        guild = bot.guilds[0] if bot.guilds else None
+        try:
+            if not guild:
+                raise RuntimeError("Guild not available")
+            if payout_date:
+                await plan_daily_payout(guild, payout_date)
+            await resume_pending_payouts(guild)
+        except Exception:
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, PAYOUT_RETRY_MAX_SECONDS)
+            continue
+        payout_date = None
+        backoff = PAYOUT_RETRY_BASE_SECONDS
+        now_local = berlin_now()
+        target = next_daily_time(21, 0)
+        await asyncio.sleep((target - now_local).total_seconds())
+        payout_date = berlin_now().date()
 
 
 async def scheduled_tasks():
@@ -1929,7 +3269,7 @@ async def scheduled_tasks():
             await asyncio.sleep(sleep_for)
             now_local = berlin_now()
             if next_panel <= now_local <= next_panel + timedelta(minutes=5):
-                await refresh_invites_panel()
+                message_updater.mark("invites_panel", refresh_invites_panel)
             if next_reset <= now_local <= next_reset + timedelta(minutes=5):
                 new_reset = now_ts()
                 next_reset_ts = int(next_daily_time(21, 0).timestamp())
@@ -1945,23 +3285,138 @@ async def scheduled_tasks():
                     INVITE_STOCK_DEFAULTS["stock_5"],
                     INVITE_STOCK_DEFAULTS["stock_10"],
                 )
-                await refresh_invites_panel()
+                message_updater.mark("invites_panel", refresh_invites_panel)
         except Exception:
             await asyncio.sleep(10)
 
 
-async def giveaway_ender():
-    while True:
-        try:
-            rows = await db_pool.fetch(
-                "SELECT * FROM giveaways WHERE ended=false AND ends_at <= $1",
-                now_ts(),
-            )
-            for row in rows:
-                await end_giveaway(row)
-        except Exception:
-            await asyncio.sleep(5)
-        await asyncio.sleep(15)
+class GiveawayScheduler:
+    def __init__(self, concurrency: int, reconcile_seconds: int):
+        self.heap: List[Tuple[int, int]] = []
+        self.scheduled: Dict[int, int] = {}
+        self.running: set[int] = set()
+        self.tasks: set[asyncio.Task] = set()
+        self.wakeup = asyncio.Event()
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.reconcile_seconds = reconcile_seconds
+        self.next_reconcile = 0.0
+
+    def schedule(self, giveaway_id: int, ends_at: int):
+        if giveaway_id in self.running or self.scheduled.get(giveaway_id) == ends_at:
+            return
+        self.scheduled[giveaway_id] = ends_at
+        heapq.heappush(self.heap, (ends_at, giveaway_id))
+        self.wakeup.set()
+
+    async def reconcile(self):
+        rows = await db_pool.fetch("SELECT id, ends_at FROM giveaways WHERE ended=false OR announced=false")
+        for row in rows:
+            self.schedule(row["id"], row["ends_at"])
+        self.next_reconcile = time.time() + self.reconcile_seconds
+
+    async def end(self, giveaway_id: int):
+        async with self.semaphore:
+            try:
+                await end_giveaway(giveaway_id)
+            except Exception:
+                pass
+            finally:
+                self.running.discard(giveaway_id)
+
+    def start_due(self):
+        current = time.time()
+        while self.heap and self.heap[0][0] <= current:
+            ends_at, giveaway_id = heapq.heappop(self.heap)
+            if self.scheduled.get(giveaway_id) != ends_at:
+                continue
+            del self.scheduled[giveaway_id]
+            self.running.add(giveaway_id)
+            task = asyncio.create_task(self.end(giveaway_id))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def run(self):
+        while True:
+            self.wakeup.clear()
+            if time.time() >= self.next_reconcile:
+                try:
+                    await self.reconcile()
+                except Exception:
+                    self.next_reconcile = time.time() + 30
+            self.start_due()
+            timeout = self.next_reconcile - time.time()
+            if self.heap:
+                timeout = min(timeout, self.heap[0][0] - time.time())
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout=max(0.0, timeout))
+            except asyncio.TimeoutError:
+                pass
+
+
+giveaway_scheduler = GiveawayScheduler(GIVEAWAY_END_CONCURRENCY, GIVEAWAY_RECONCILE_SECONDS)
+
+
+def build_giveaway_embed(
+    is_big: bool,
+    prize: str,
+    winner_count: int,
+    ends_at: int,
+    host_name: Optional[str],
+    entrant_count: int = 0,
+    total_entries: int = 0,
+) -> discord.Embed:
+    if is_big:
+        kind, title = "giveaway_big", f"{EMOJI['star']} BIG Giveaway"
+    else:
+        kind, title = "giveaway_normal", f"{EMOJI['heart']} {EMOJI['star']} Giveaway"
+    embed = build_embed(
+        kind,
+        title,
+        "Spend entries to enter. Each entry increases your weight.",
+        [
+            ("Prize", prize, False),
+            ("Winners", str(winner_count), True),
+            ("Ends", f"<t:{ends_at}:R>", True),
+            ("Entrants", f"{entrant_count:,}", True),
+            ("Total entries", f"{total_entries:,}", True),
+        ],
+        include_banner=False,
+    )
+    if host_name:
+        embed.set_footer(text=f"Hosted by {host_name}")
+    return embed
+
+
+async def refresh_giveaway_message(giveaway_id: int):
+    row = await db_pool.fetchrow(
+        """
+        SELECT channel_id, message_id, prize, winner_count, is_big, ends_at, created_by,
+               entrant_count, total_entries
+        FROM giveaways
+        WHERE id=$1 AND ended=false
+        """,
+        giveaway_id,
+    )
+    if not row or not row["message_id"]:
+        return
+    channel = bot.get_channel(row["channel_id"])
+    if not isinstance(channel, (discord.TextChannel, discord.Thread)):
+        return
+    host = await member_resolver.resolve(channel.guild, row["created_by"])
+    embed = build_giveaway_embed(
+        row["is_big"],
+        row["prize"],
+        row["winner_count"],
+        row["ends_at"],
+        host.display_name if host else None,
+        row["entrant_count"],
+        row["total_entries"],
+    )
+    await channel.get_partial_message(row["message_id"]).edit(embed=embed)
+
+
+def mark_giveaway_dirty(giveaway_id: int):
+    message_updater.mark(("giveaway", giveaway_id), lambda: refresh_giveaway_message(giveaway_id))
 
 
 async def disable_giveaway_message(channel: discord.abc.Messageable, giveaway_id: int, message_id: Optional[int]):
@@ -1977,133 +3432,211 @@ async def disable_giveaway_message(channel: discord.abc.Messageable, giveaway_id
         return
 
 
-async def end_giveaway(row: asyncpg.Record):
+def booster_member_ids(guild: Optional[discord.Guild]) -> List[int]:
+    booster_role = guild.get_role(BOOSTER_ROLE_ID) if guild else None
+    return [member.id for member in booster_role.members] if booster_role else []
+
+
+async def claim_giveaway(giveaway_id: int) -> bool:
+    """Ends a giveaway exactly once."""
+    async with db_pool.acquire() as conn:
+        async with conn.transaction():
+            row = await conn.fetchrow(
+                """
+                UPDATE giveaways
+                SET ended=true, announced=false
+                WHERE id=$1 AND ended=false
+                RETURNING *
+                """,
+                giveaway_id,
+            )
+            if not row:
+                return False
+            channel = bot.get_channel(row["channel_id"])
+            if isinstance(channel, discord.abc.GuildChannel):
+                guild = channel.guild
+            else:
+                guild = bot.guilds[0] if bot.guilds else None
+            winners, draw_details = await draw_giveaway_winners(
+                conn,
+                giveaway_id,
+                row["winner_count"],
+                booster_member_ids(guild),
+            )
+            if winners:
+                await conn.execute(
+                    """
+                    INSERT INTO giveaway_winners (giveaway_id, user_id, position)
+                    SELECT $1, w.user_id, w.position
+                    FROM UNNEST($2::bigint[]) WITH ORDINALITY AS w(user_id, position)
+                    """,
+                    giveaway_id,
+                    winners,
+                )
+    invalidate_entrants_cache(giveaway_id)
+    if winners:
+        log_event(
+            "giveaway_ended",
+            row["created_by"],
+            {"giveaway_id": giveaway_id, "winners": winners, **draw_details},
+        )
+    else:
+        log_event("giveaway_no_participants", row["created_by"], {"giveaway_id": giveaway_id})
+    return True
+
+
+async def announce_giveaway(giveaway_id: int):
+    current = now_ts()
+    row = await db_pool.fetchrow(
+        """
+        UPDATE giveaways
+        SET announce_lease=$2
+        WHERE id=$1 AND ended=true AND announced=false AND announce_lease <= $3
+        RETURNING *
+        """,
+        giveaway_id,
+        current + GIVEAWAY_ANNOUNCE_LEASE_SECONDS,
+        current,
+    )
+    if not row:
+        return
     channel = bot.get_channel(row["channel_id"])
     if not channel:
         try:
             channel = await bot.fetch_channel(row["channel_id"])
         except (discord.NotFound, discord.Forbidden):
+            await db_pool.execute("UPDATE giveaways SET announced=true WHERE id=$1", giveaway_id)
             return
-    giveaway_id = row["id"]
     await disable_giveaway_message(channel, giveaway_id, row["message_id"])
-    entries = await db_pool.fetch(
-        "SELECT user_id, entries_spent FROM giveaway_entries WHERE giveaway_id=$1",
+    winner_rows = await db_pool.fetch(
+        "SELECT user_id FROM giveaway_winners WHERE giveaway_id=$1 ORDER BY position",
         giveaway_id,
     )
+    winners = [winner["user_id"] for winner in winner_rows]
     kind = "giveaway_big" if row["is_big"] else "giveaway_normal"
-    if not entries:
+    if not winners:
         embed = build_embed(
             kind,
             f"{EMOJI['moonlight']} Giveaway Ended",
             "No participants joined this time.",
             [("Prize", row["prize"], False)],
         )
-        await channel.send(embed=embed)
-        await db_pool.execute("UPDATE giveaways SET ended=true WHERE id=$1", giveaway_id)
-        await log_event("giveaway_no_participants", row["created_by"], f"Giveaway {giveaway_id} ended empty")
-        return
+    else:
+        guild = channel.guild if isinstance(channel, discord.abc.GuildChannel) else None
+        members = await member_resolver.resolve_many(guild, winners) if guild else {}
+        winner_lines = []
+        for user_id in winners:
+            member = members.get(user_id)
+            emoji = await get_economy_emoji_for_member(member)
+            mention = member.mention if member else f"<@{user_id}>"
+            winner_lines.append(f"{emoji} {mention} {emoji}")
+        winner_mentions = "\n".join(winner_lines)
+        embed = build_embed(
+            kind,
+            f"{EMOJI['star']} Winners!",
+            "Congrats to the winners!",
+            [
+                ("Prize", row["prize"], False),
+                ("Winners", winner_mentions, False),
+            ],
+        )
+    await channel.send(embed=embed)
+    await db_pool.execute("UPDATE giveaways SET announced=true WHERE id=$1", giveaway_id)
+
+
+async def end_giveaway(giveaway_id: int):
+    await claim_giveaway(giveaway_id)
+    await announce_giveaway(giveaway_id)
+
+
+async def draw_giveaway_winners(
+    conn: asyncpg.Connection,
+    giveaway_id: int,
+    winner_count: int,
+    booster_ids: List[int],
+) -> Tuple[List[int], Dict[str, object]]:
+    if GIVEAWAY_DRAW_MODE == "server":
+        rows = await conn.fetch(
+            """
+            SELECT user_id
+            FROM giveaway_entries
+            WHERE giveaway_id=$1 AND entries_spent > 0
+            ORDER BY ln(1 - random()) / (
+                CASE WHEN user_id = ANY($2::bigint[])
+                     THEN GREATEST(1, round(entries_spent * 1.10))
+                     ELSE entries_spent
+                END
+            ) DESC
+            LIMIT $3
+            """,
+            giveaway_id,
+            booster_ids,
+            winner_count,
+        )
+        return [row["user_id"] for row in rows], {"draw_mode": "server"}
+    entries = await conn.fetch(
+        "SELECT user_id, entries_spent FROM giveaway_entries WHERE giveaway_id=$1",
+        giveaway_id,
+    )
+    boosters = set(booster_ids)
     weights = []
-    guild = channel.guild if isinstance(channel, discord.abc.GuildChannel) else None
     for entry in entries:
         user_id = entry["user_id"]
         spent = entry["entries_spent"]
-        member = guild.get_member(user_id) if guild else None
-        if not member and guild:
-            try:
-                member = await guild.fetch_member(user_id)
-            except (discord.NotFound, discord.Forbidden):
-                member = None
-        if has_booster_role(member):
+        if user_id in boosters:
             spent = max(1, int(round(spent * 1.10)))
         weights.append((user_id, spent))
-    winners = pick_weighted_winners(weights, row["winner_count"])
-    winner_lines = []
-    for user_id in winners:
-        member = guild.get_member(user_id) if guild else None
-        if not member and guild:
-            try:
-                member = await guild.fetch_member(user_id)
-            except (discord.NotFound, discord.Forbidden):
-                member = None
-        emoji = await get_economy_emoji_for_member(member)
-        mention = member.mention if member else f"<@{user_id}>"
-        winner_lines.append(f"{emoji} {mention} {emoji}")
-    winner_mentions = "\n".join(winner_lines)
-    embed = build_embed(
-        kind,
-        f"{EMOJI['star']} Winners!",
-        "Congrats to the winners!",
-        [
-            ("Prize", row["prize"], False),
-            ("Winners", winner_mentions, False),
-        ],
+    draw_seed = secrets.randbits(64)
+    winners = pick_weighted_winners(weights, winner_count, random.Random(draw_seed))
+    return winners, {"draw_mode": "local", "draw_seed": draw_seed}
+
+
+def pick_weighted_winners(
+    entries: List[Tuple[int, int]],
+    count: int,
+    rng: Optional[random.Random] = None,
+) -> List[int]:
+    """Weighted sampling without replacement (Efraimidis-Spirakis)."""
+    rng = rng or random
+    keyed = (
+        (math.log(1.0 - rng.random()) / weight, user_id)
+        for user_id, weight in entries
+        if weight > 0
     )
-    await channel.send(embed=embed)
-    await db_pool.execute("UPDATE giveaways SET ended=true WHERE id=$1", giveaway_id)
-    await log_event("giveaway_ended", row["created_by"], f"Giveaway {giveaway_id} ended")
-
-
-def pick_weighted_winners(entries: List[Tuple[int, int]], count: int) -> List[int]:
-    winners = []
-    pool = entries.copy()
-    while pool and len(winners) < count:
-        total = sum(weight for _, weight in pool)
-        roll = random.uniform(0, total)
-        upto = 0
-        for user_id, weight in pool:
-            upto += weight
-            if roll <= upto:
-                winners.append(user_id)
-                pool = [(uid, w) for uid, w in pool if uid != user_id]
-                break
-    return winners
+    return [user_id for _, user_id in heapq.nlargest(count, keyed)]
 
 
 async def get_economy_emoji_for_member(member: Optional[discord.Member]) -> str:
     if not member or not member.guild:
         return EMOJI["star"]
-    for emoji_key, _, role_id, _, _ in reversed(RANKS):
-        role = member.guild.get_role(role_id)
-        if role and role in member.roles:
-            return EMOJI[emoji_key]
-    return EMOJI["star"]
+    rank = rank_index.highest_held(member)
+    return EMOJI[rank[0]] if rank else EMOJI["star"]
 
 
-async def process_rng(message: discord.Message):
+async def roll_rng(message: discord.Message) -> Tuple[int, Optional[str]]:
     user_id = message.author.id
-    state = await db_pool.fetchrow("SELECT * FROM automod_state WHERE user_id=$1", user_id)
-    if not state:
-        await db_pool.execute(
-            "INSERT INTO automod_state (user_id) VALUES ($1)",
-            user_id,
-        )
-        state = await db_pool.fetchrow("SELECT * FROM automod_state WHERE user_id=$1", user_id)
+    state = await automod_cache.get(user_id)
     if state["no_entry_until"] > now_ts():
-        return
+        return 0, None
     if state["rng_cooldown_until"] > now_ts():
-        return
+        return 0, None
     roll = random.random()
-    award = None
-    public = False
+    award = 0
+    title = None
     if roll < 0.000001:
         award = 250
-        public = True
         title = f"{EMOJI['star']} Huge Drop!"
     elif roll < 0.000011:
         award = 100
-        public = True
         title = f"{EMOJI['star']} Jackpot!"
     elif roll < 0.000111:
         award = 50
-        public = True
         title = f"{EMOJI['star']} Big Bonus!"
     elif roll < 0.00111:
         award = 25
-        public = True
         title = f"{EMOJI['star']} Lucky +25"
     elif roll < 0.00361:
         award = 10
-        public = True
         title = f"{EMOJI['star']} Lucky +10"
     elif roll < 0.00861:
         award = 8
@@ -2115,55 +3648,36 @@ async def process_rng(message: discord.Message):
         award = 2
     elif roll < 0.19361:
         award = 1
-    if not award:
-        await db_pool.execute(
-            "UPDATE automod_state SET rng_cooldown_until=$1 WHERE user_id=$2",
-            now_ts() + RNG_COOLDOWN,
-            user_id,
-        )
-        return
+    automod_cache.update(user_id, rng_cooldown_until=now_ts() + RNG_COOLDOWN)
     if award and has_booster_role(message.author if isinstance(message.author, discord.Member) else None):
         boosted = int(round(award * 1.25))
         award = max(1, boosted)
-    async with db_pool.acquire() as conn:
-        async with conn.transaction():
-            await ensure_user(conn, user_id)
-            row = await conn.fetchrow(
-                "SELECT entries FROM users WHERE user_id=$1 FOR UPDATE",
-                user_id,
-            )
-            old_balance = int(row["entries"])
-            new_balance = old_balance + award
-            await conn.execute(
-                "UPDATE users SET entries=$1 WHERE user_id=$2",
-                new_balance,
-                user_id,
-            )
-            await conn.execute(
-                "UPDATE automod_state SET rng_cooldown_until=$1 WHERE user_id=$2",
-                now_ts() + RNG_COOLDOWN,
-                user_id,
-            )
-    if isinstance(message.author, discord.Member):
-        await update_user_roles(message.author, new_balance)
-    await log_event(
+    return award, title
+
+
+async def process_rng(message: discord.Message):
+    award, title = await roll_rng(message)
+    message_ingest.submit(IngestedMessage(message=message, award=award, title=title))
+
+
+async def announce_rng_award(item: "IngestedMessage", old_balance: int, new_balance: int):
+    message = item.message
+    log_event(
         "entries_gain",
-        user_id,
-        json.dumps(
-            {
-                "source": "chat_rng",
-                "amount": award,
-                "old_balance": old_balance,
-                "new_balance": new_balance,
-                "channel_id": message.channel.id,
-            }
-        ),
+        message.author.id,
+        {
+            "source": "chat_rng",
+            "amount": item.award,
+            "old_balance": old_balance,
+            "new_balance": new_balance,
+            "channel_id": message.channel.id,
+        },
     )
-    if public:
-        description = f"{message.author.mention} gained **+{award}** entries!"
+    if item.title:
+        description = f"{message.author.mention} gained **+{item.award}** entries!"
         embed = build_embed(
             "rng",
-            title,
+            item.title,
             description,
             [("Hype", "Keep chatting for more drops!", False)],
         )
@@ -2173,23 +3687,155 @@ async def process_rng(message: discord.Message):
             return
 
 
+@dataclass
+class IngestedMessage:
+    message: discord.Message
+    award: int
+    title: Optional[str]
+
+
+class MessageIngestQueue:
+    def __init__(self, window_ms: int, max_size: int):
+        self.window = max(0.0, window_ms / 1000)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        self.commit_lock = asyncio.Lock()
+        self.announce_tasks: set[asyncio.Task] = set()
+        self.holding: Optional[IngestedMessage] = None
+        self.metrics = {
+            "enqueued": 0,
+            "dropped": 0,
+            "max_depth": 0,
+            "batches": 0,
+            "rows": 0,
+            "failed_batches": 0,
+            "last_batch_size": 0,
+            "last_commit_ms": 0.0,
+        }
+
+    def submit(self, item: IngestedMessage):
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.metrics["dropped"] += 1
+            return
+        self.metrics["enqueued"] += 1
+        self.metrics["max_depth"] = max(self.metrics["max_depth"], self.queue.qsize())
+
+    def drain(self, first: Optional[IngestedMessage] = None) -> List[IngestedMessage]:
+        batch = [first] if first else []
+        while True:
+            try:
+                batch.append(self.queue.get_nowait())
+            except asyncio.QueueEmpty:
+                return batch
+
+    async def commit(self, batch: List[IngestedMessage]):
+        if not batch:
+            return
+        counts: Dict[int, List[int]] = {}
+        for item in batch:
+            totals = counts.setdefault(item.message.author.id, [0, 0])
+            totals[0] += item.award
+            totals[1] += 1
+        user_ids = list(counts)
+        started = asyncio.get_running_loop().time()
+        async with self.commit_lock:
+            async with db_pool.acquire() as conn:
+                changes = await entries_ledger.credit_messages(
+                    conn,
+                    user_ids,
+                    [counts[uid][0] for uid in user_ids],
+                    [counts[uid][1] for uid in user_ids],
+                    "chat_rng",
+                )
+        self.metrics["batches"] += 1
+        self.metrics["rows"] += len(user_ids)
+        self.metrics["last_batch_size"] = len(batch)
+        self.metrics["last_commit_ms"] = round((asyncio.get_running_loop().time() - started) * 1000, 2)
+        awarded = [item for item in batch if item.award]
+        if not awarded:
+            return
+        task = asyncio.create_task(self._announce(awarded, changes))
+        self.announce_tasks.add(task)
+        task.add_done_callback(self.announce_tasks.discard)
+
+    async def _announce(
+        self,
+        awarded: List[IngestedMessage],
+        changes: Dict[int, BalanceChange],
+    ):
+        running = {uid: change.old_balance for uid, change in changes.items()}
+        members: Dict[int, discord.Member] = {}
+        for item in awarded:
+            user_id = item.message.author.id
+            if user_id not in running:
+                continue
+            old_balance = running[user_id]
+            running[user_id] = old_balance + item.award
+            if isinstance(item.message.author, discord.Member):
+                members[user_id] = item.message.author
+            try:
+                await announce_rng_award(item, old_balance, running[user_id])
+            except Exception:
+                pass
+        for user_id, member in members.items():
+            rank_reconciler.schedule(member, changes[user_id].new_balance)
+
+    async def _commit_with_retry(self, batch: List[IngestedMessage]):
+        error = None
+        for attempt in range(3):
+            try:
+                await self.commit(batch)
+                return
+            except Exception as exc:
+                error = exc
+                await asyncio.sleep(1 + attempt)
+        self.metrics["failed_batches"] += 1
+        log_event(
+            "ingest_batch_dropped",
+            None,
+            {
+                "messages": len(batch),
+                "users": len({item.message.author.id for item in batch}),
+                "entries_lost": sum(item.award for item in batch),
+                "error": str(error),
+            },
+        )
+
+    async def flush(self):
+        first, self.holding = self.holding, None
+        await self._commit_with_retry(self.drain(first))
+        if self.announce_tasks:
+            await asyncio.gather(*self.announce_tasks, return_exceptions=True)
+
+    async def run(self):
+        while True:
+            self.holding = await self.queue.get()
+            await asyncio.sleep(self.window)
+            first, self.holding = self.holding, None
+            await self._commit_with_retry(self.drain(first))
+
+
+message_ingest = MessageIngestQueue(INGEST_WINDOW_MS, INGEST_QUEUE_MAX)
+shutdown_hooks.append(message_ingest.flush)
+shutdown_hooks.append(log_sink.flush)
+
+
 async def apply_automod(message: discord.Message) -> bool:
     if message.author.bot:
         return False
     if message.author.guild_permissions.manage_guild:
         normalized = normalize_message(message.content)
         if normalized and (LINK_REGEX.search(normalized) or any(word in normalized for word in BLACKLIST)):
-            await log_event(
+            log_event(
                 "admin_bypass",
                 message.author.id,
-                json.dumps(
-                    {
-                        "reason": "flagged_content_bypassed",
-                        "channel_id": message.channel.id,
-                        "message_id": message.id,
-                        "content": message.content[:300],
-                    }
-                ),
+                {
+                    "reason": "flagged_content_bypassed",
+                    "channel_id": message.channel.id,
+                    "message_id": message.id,
+                    "content": message.content[:300],
+                },
             )
         channel_state = consecutive_message_tracker.get(message.channel.id)
         if channel_state and channel_state[0] == message.author.id:
@@ -2199,53 +3845,35 @@ async def apply_automod(message: discord.Message) -> bool:
         consecutive_message_tracker[message.channel.id] = (message.author.id, consecutive_count)
         return False
     user_id = message.author.id
-    state = await db_pool.fetchrow("SELECT * FROM automod_state WHERE user_id=$1", user_id)
-    if not state:
-        await db_pool.execute("INSERT INTO automod_state (user_id) VALUES ($1)", user_id)
-        state = await db_pool.fetchrow("SELECT * FROM automod_state WHERE user_id=$1", user_id)
+    state = await automod_cache.get(user_id)
     current = now_ts()
     normalized = normalize_message(message.content)
     msg_hash = hash_message(normalized)
     link_detected = LINK_REGEX.search(normalized) if normalized else False
     blacklist_detected = any(word in normalized for word in BLACKLIST) if normalized else False
-    await db_pool.execute(
-        """
-        UPDATE automod_state
-        SET last_msg_hash=$1, last_msg_ts=$2
-        WHERE user_id=$3
-        """,
-        msg_hash,
-        current,
-        user_id,
-    )
+    automod_cache.update(user_id, last_msg_hash=msg_hash, last_msg_ts=current)
     if link_detected or blacklist_detected:
         try:
             await message.delete()
         except (discord.Forbidden, discord.NotFound):
             pass
-        await db_pool.execute(
-            "UPDATE automod_state SET no_entry_until=$1 WHERE user_id=$2",
-            current + 120,
-            user_id,
-        )
+        automod_cache.update(user_id, no_entry_until=current + 120)
         try:
             await message.author.send("Please avoid spam or prohibited content. Further issues may result in action.")
         except (discord.Forbidden, discord.HTTPException):
             pass
         reason = "link" if link_detected else "language"
-        await log_event(
+        log_event(
             "automod_punishment",
             user_id,
-            json.dumps(
-                {
-                    "reason": reason,
-                    "channel_id": message.channel.id,
-                    "message_id": message.id,
-                    "content": message.content[:300],
-                    "duration_seconds": 120,
-                    "no_entry_until": current + 120,
-                }
-            ),
+            {
+                "reason": reason,
+                "channel_id": message.channel.id,
+                "message_id": message.id,
+                "content": message.content[:300],
+                "duration_seconds": 120,
+                "no_entry_until": current + 120,
+            },
         )
         return True
     channel_state = consecutive_message_tracker.get(message.channel.id)
@@ -2262,11 +3890,7 @@ async def apply_automod(message: discord.Message) -> bool:
         already_active = state["no_entry_until"] > current
         no_entry_until = state["no_entry_until"] if already_active else current + 120
         if not already_active:
-            await db_pool.execute(
-                "UPDATE automod_state SET no_entry_until=$1 WHERE user_id=$2",
-                no_entry_until,
-                user_id,
-            )
+            automod_cache.update(user_id, no_entry_until=no_entry_until)
         public_message = (
             f"{message.author.mention} {EMOJI['staff_hammer']} "
             "Please slow down and stop repeating. You can keep chatting, but entry rewards are paused for 2 minutes."
@@ -2279,17 +3903,15 @@ async def apply_automod(message: discord.Message) -> bool:
             )
         except (discord.Forbidden, discord.HTTPException):
             pass
-        await log_event(
+        log_event(
             "automod_entry_ban",
             user_id,
-            json.dumps(
-                {
-                    "reason": entry_ban_reason,
-                    "channel_id": message.channel.id,
-                    "no_entry_until": no_entry_until,
-                    "already_active": already_active,
-                }
-            ),
+            {
+                "reason": entry_ban_reason,
+                "channel_id": message.channel.id,
+                "no_entry_until": no_entry_until,
+                "already_active": already_active,
+            },
         )
         return True
     return False
@@ -2297,16 +3919,13 @@ async def apply_automod(message: discord.Message) -> bool:
 
 @bot.event
 async def on_ready():
-    global db_pool
-    db_pool = await asyncpg.create_pool(
-        dsn=os.getenv("DATABASE_URL"),
-        min_size=1,
-        max_size=5
-    )
+    await db_pool.connect()
     print("✅ Database connected")
     if bot.user and bot.user.name != "Axolotl":
         await bot.user.edit(username="Axolotl")
     await run_migrations()
+    async with db_pool.acquire() as conn:
+        await ensure_ledger_partitions(conn)
     await get_event_state()
     bot.add_view(BankView())
     bot.add_view(InvitesPanelView())
@@ -2331,18 +3950,49 @@ async def on_ready():
     rows = await db_pool.fetch("SELECT channel_id FROM tickets WHERE open=true")
     for row in rows:
         bot.add_view(TicketCloseView(row["channel_id"]))
-    active_giveaways = await db_pool.fetch("SELECT id FROM giveaways WHERE ended=false")
+    active_giveaways = await db_pool.fetch(
+        "SELECT id, ends_at, ended FROM giveaways WHERE ended=false OR announced=false"
+    )
     for row in active_giveaways:
-        bot.add_view(GiveawayView(row["id"]))
+        if not row["ended"]:
+            bot.add_view(GiveawayView(row["id"]))
+        giveaway_scheduler.schedule(row["id"], row["ends_at"])
     guilds = bot.guilds
     if guilds:
+        rank_index.refresh(guilds[0])
         await update_invites_cache(guilds[0])
         for member in guilds[0].members:
             await sync_free_generator_role(member)
     if not background_tasks:
-        background_tasks.append(asyncio.create_task(giveaway_ender()))
+        background_tasks.append(asyncio.create_task(giveaway_scheduler.run()))
         background_tasks.append(asyncio.create_task(scheduled_tasks()))
         background_tasks.append(asyncio.create_task(daily_role_payout()))
+        background_tasks.append(asyncio.create_task(automod_cache.run()))
+        background_tasks.append(asyncio.create_task(message_ingest.run()))
+        background_tasks.append(asyncio.create_task(log_sink.run_rows()))
+        background_tasks.append(asyncio.create_task(log_sink.run_embeds()))
+        background_tasks.append(asyncio.create_task(log_sink.run_digest()))
+        background_tasks.append(asyncio.create_task(rank_reconciler.run()))
+        background_tasks.append(asyncio.create_task(message_updater.run()))
+        background_tasks.append(asyncio.create_task(ledger_snapshot_loop()))
+
+
+@bot.event
+async def on_guild_role_create(role: discord.Role):
+    if rank_index.is_rank_role(role.id):
+        rank_index.refresh(role.guild)
+
+
+@bot.event
+async def on_guild_role_delete(role: discord.Role):
+    if rank_index.is_rank_role(role.id):
+        rank_index.refresh(role.guild)
+
+
+@bot.event
+async def on_guild_role_update(before: discord.Role, after: discord.Role):
+    if rank_index.is_rank_role(after.id):
+        rank_index.refresh(after.guild)
 
 
 @bot.event
@@ -2406,7 +4056,7 @@ async def on_member_join(member: discord.Member):
             code_row["code"],
         )
     if not valid:
-        await log_event("invite_invalid", member.id, f"Invite invalid: {invalid_reason}")
+        log_event("invite_invalid", member.id, {"reason": invalid_reason, "invite_id": used_invite.code})
 
 
 @bot.event
@@ -2416,7 +4066,6 @@ async def on_message(message: discord.Message):
     punished = await apply_automod(message)
     if not punished:
         await process_rng(message)
-        await increment_daily_message(message.author.id)
     await bot.process_commands(message)
 
 
@@ -2463,7 +4112,7 @@ async def restock_generator(ctx: commands.Context, tier: str, accounts: str):
     embed.add_field(name="Added", value=str(added), inline=True)
     embed.add_field(name="Skipped", value=str(skipped), inline=True)
     await ctx.send(embed=embed)
-    await log_event("admin_command", ctx.author.id, f"!restock_{tier}")
+    log_event("admin_command", ctx.author.id, {"command": f"!restock_{tier}", "added": added, "skipped": skipped})
 
 
 @bot.command()
@@ -2503,71 +4152,55 @@ async def handle_gen(ctx: commands.Context, tier: str, required_role_id: int):
             await ctx.send(f"⏳ Please wait {remaining}s before generating again.")
             return
 
-    async with db_pool.acquire() as conn:
-        async with conn.transaction():
-            row = await conn.fetchrow(
-                """
-                WITH picked AS (
-                    SELECT id, username, password
-                    FROM generator_stock
-                    WHERE tier=$1 AND claimed=FALSE
-                    ORDER BY id ASC
-                    FOR UPDATE SKIP LOCKED
-                    LIMIT 1
-                )
-                UPDATE generator_stock
-                SET claimed=TRUE, claimed_by=$2, claimed_at=$3
-                FROM picked
-                WHERE generator_stock.id = picked.id
-                RETURNING picked.username, picked.password
-                """,
-                tier,
-                ctx.author.id,
-                now,
-            )
-            actual_tier = tier
-            if not row and tier == "premium":
-                row = await conn.fetchrow(
-                    """
-                    WITH picked AS (
-                        SELECT id, username, password
-                        FROM generator_stock
-                        WHERE tier=$1 AND claimed=FALSE
-                        ORDER BY id ASC
-                        FOR UPDATE SKIP LOCKED
-                        LIMIT 1
-                    )
-                    UPDATE generator_stock
-                    SET claimed=TRUE, claimed_by=$2, claimed_at=$3
-                    FROM picked
-                    WHERE generator_stock.id = picked.id
-                    RETURNING picked.username, picked.password
-                    """,
-                    "free",
-                    ctx.author.id,
-                    now,
-                )
-                if row:
-                    actual_tier = "free"
-            if not row:
-                await ctx.send("⚠️ No accounts are available right now. Please try again later.")
-                return
-            await conn.execute(
-                """
-                INSERT INTO generator_cooldowns (user_id, last_gen)
-                VALUES ($1, $2)
-                ON CONFLICT (user_id) DO UPDATE SET last_gen=EXCLUDED.last_gen
-                """,
-                ctx.author.id,
-                now,
-            )
-            await conn.execute(
-                "UPDATE generator_stats SET global_generations=global_generations+1 WHERE tier=$1",
-                actual_tier,
+    async def work(conn: asyncpg.Connection) -> WorkResult:
+        claim_sql = """
+            WITH picked AS (
+                SELECT id, username, password
+                FROM generator_stock
+                WHERE tier=$1 AND claimed=FALSE
+                ORDER BY id ASC
+                FOR UPDATE SKIP LOCKED
+                LIMIT 1
             )
+            UPDATE generator_stock
+            SET claimed=TRUE, claimed_by=$2, claimed_at=$3
+            FROM picked
+            WHERE generator_stock.id = picked.id
+            RETURNING picked.username, picked.password
+        """
+        row = await conn.fetchrow(claim_sql, tier, ctx.author.id, now)
+        actual_tier = tier
+        if not row and tier == "premium":
+            row = await conn.fetchrow(claim_sql, "free", ctx.author.id, now)
+            if row:
+                actual_tier = "free"
+        if not row:
+            return WorkResult(False, "out_of_stock")
+        await conn.execute(
+            """
+            INSERT INTO generator_cooldowns (user_id, last_gen)
+            VALUES ($1, $2)
+            ON CONFLICT (user_id) DO UPDATE SET last_gen=EXCLUDED.last_gen
+            """,
+            ctx.author.id,
+            now,
+        )
+        await conn.execute(
+            "UPDATE generator_stats SET global_generations=global_generations+1 WHERE tier=$1",
+            actual_tier,
+        )
+        return WorkResult(
+            True,
+            values={"username": row["username"], "password": row["password"], "tier": actual_tier},
+        )
 
-    username = row["username"]
-    password = row["password"]
+    result = await unit_of_work(work)
+    if not result.ok:
+        await ctx.send("⚠️ No accounts are available right now. Please try again later.")
+        return
+    username = result.values["username"]
+    password = result.values["password"]
+    actual_tier = result.values["tier"]
     color = GENERATOR_TIER_COLORS.get(actual_tier, discord.Color.blurple())
     dm_embed = discord.Embed(
         title="🔐 Your Generated Account",
@@ -2737,6 +4370,86 @@ async def chance(ctx: commands.Context):
     await ctx.send(embed=embed)
 
 
+@bot.command()
+@commands.has_guild_permissions(manage_guild=True)
+async def ingest_stats(ctx: commands.Context):
+    metrics = message_ingest.metrics
+    embed = build_embed(
+        "logs",
+        "📥 Message Ingest Stats",
+        f"Window: **{INGEST_WINDOW_MS} ms** • Queue limit: **{INGEST_QUEUE_MAX:,}**",
+        [
+            ("Queue depth", f"{message_ingest.queue.qsize():,}", True),
+            ("Max depth", f"{metrics['max_depth']:,}", True),
+            ("Dropped", f"{metrics['dropped']:,}", True),
+            ("Messages", f"{metrics['enqueued']:,}", True),
+            ("Batches", f"{metrics['batches']:,}", True),
+            ("Rows upserted", f"{metrics['rows']:,}", True),
+            ("Last batch", f"{metrics['last_batch_size']:,} msgs • {metrics['last_commit_ms']} ms", True),
+            ("Failed batches", f"{metrics['failed_batches']:,}", True),
+        ],
+        include_banner=False,
+    )
+    await ctx.send(embed=embed)
+
+
+@bot.command()
+@commands.has_guild_permissions(manage_guild=True)
+async def db_stats(ctx: commands.Context):
+    metrics = db_pool.metrics
+    pool = db_pool.pool
+    checkouts = metrics["checkouts"]
+    avg_wait = metrics["wait_ms_total"] / checkouts if checkouts else 0.0
+    embed = build_embed(
+        "logs",
+        "🗄️ Database Pool Stats",
+        f"Pool: **{DB_POOL_MIN_SIZE}-{DB_POOL_MAX_SIZE}** • Statement cache: **{DB_STATEMENT_CACHE_SIZE:,}**",
+        [
+            ("Open connections", f"{pool.get_size() if pool else 0:,}", True),
+            ("In use", f"{db_pool.in_use:,}", True),
+            ("Peak in use", f"{metrics['peak_in_use']:,}", True),
+            ("Checkouts", f"{checkouts:,}", True),
+            ("Had to wait", f"{metrics['waited']:,}", True),
+            ("Wait avg / max", f"{avg_wait:.2f} ms • {metrics['wait_ms_max']:.1f} ms", True),
+            (
+                "Balance cache",
+                f"{len(balance_cache.balances):,} users • {balance_cache.hit_rate:.1%} hits",
+                True,
+            ),
+        ],
+        include_banner=False,
+    )
+    await ctx.send(embed=embed)
+
+
+@bot.command()
+@commands.has_guild_permissions(manage_guild=True)
+async def ledger(ctx: commands.Context, member: discord.Member):
+    rows = await db_pool.fetch(
+        """
+        SELECT delta, source, ref_id, ts
+        FROM entries_ledger
+        WHERE user_id=$1
+        ORDER BY ts DESC
+        LIMIT 15
+        """,
+        member.id,
+    )
+    lines = []
+    for row in rows:
+        ref = f" • `{row['ref_id']}`" if row["ref_id"] else ""
+        when = f"<t:{row['ts']}:R>" if row["ts"] else "opening"
+        lines.append(f"**{row['delta']:+,}** {row['source']}{ref} • {when}")
+    embed = build_embed(
+        "logs",
+        f"📒 Ledger • {member.display_name}",
+        "\n".join(lines) if lines else "No ledger entries yet.",
+        [],
+        include_banner=False,
+    )
+    await ctx.send(embed=embed)
+
+
 @bot.command()
 @commands.has_guild_permissions(manage_guild=True)
 async def dice(ctx: commands.Context):
@@ -2756,7 +4469,7 @@ async def dice(ctx: commands.Context):
     )
     embed.set_footer(text="Axolotl • Dice roll panel")
     await ctx.send(embed=embed, view=DicePanelView())
-    await log_event("admin_command", ctx.author.id, "!dice")
+    log_event("admin_command", ctx.author.id, {"command": "!dice"})
 
 
 @bot.command()
@@ -2764,7 +4477,7 @@ async def dice(ctx: commands.Context):
 async def bank(ctx: commands.Context):
     await send_command_banner(ctx.channel, "bank")
     await create_bank_panel(ctx.channel, include_banner=False)
-    await log_event("admin_command", ctx.author.id, "!bank")
+    log_event("admin_command", ctx.author.id, {"command": "!bank"})
 
 
 @bot.command()
@@ -2772,7 +4485,7 @@ async def bank(ctx: commands.Context):
 async def support(ctx: commands.Context):
     await send_command_banner(ctx.channel, "support")
     await create_support_panel(ctx.channel, include_banner=False)
-    await log_event("admin_command", ctx.author.id, "!support")
+    log_event("admin_command", ctx.author.id, {"command": "!support"})
 
 
 @bot.command()
@@ -2780,7 +4493,7 @@ async def support(ctx: commands.Context):
 async def script(ctx: commands.Context):
     await send_command_banner(ctx.channel, "script")
     await create_script_panel(ctx.channel, include_banner=False)
-    await log_event("admin_command", ctx.author.id, "!script")
+    log_event("admin_command", ctx.author.id, {"command": "!script"})
 
 
 @bot.command()
@@ -2788,7 +4501,7 @@ async def script(ctx: commands.Context):
 async def boost(ctx: commands.Context):
     await send_command_banner(ctx.channel, "boost")
     await create_boost_panel(ctx.channel, include_banner=False)
-    await log_event("admin_command", ctx.author.id, "!boost")
+    log_event("admin_command", ctx.author.id, {"command": "!boost"})
 
 
 @bot.command()
@@ -2801,7 +4514,7 @@ async def invites(ctx: commands.Context):
         return
     await send_command_banner(channel, "invite")
     await create_invites_panel(channel, event_state, include_banner=False)
-    await log_event("admin_command", ctx.author.id, "!invites")
+    log_event("admin_command", ctx.author.id, {"command": "!invites"})
 
 
 @bot.command()
@@ -2826,18 +4539,7 @@ async def host(ctx: commands.Context, *args: str):
         return
     end_timestamp = now_ts() + duration
     await send_command_banner(ctx.channel, "giveaway_normal")
-    embed = build_embed(
-        "giveaway_normal",
-        f"{EMOJI['heart']} {EMOJI['star']} Giveaway",
-        "Spend entries to enter. Each entry increases your weight.",
-        [
-            ("Prize", prize, False),
-            ("Winners", str(winner_amount), True),
-            ("Ends", f"<t:{end_timestamp}:R>", True),
-        ],
-        include_banner=False,
-    )
-    embed.set_footer(text=f"Hosted by {ctx.author.display_name}")
+    embed = build_giveaway_embed(False, prize, winner_amount, end_timestamp, ctx.author.display_name)
     channel = ctx.channel
     row = await db_pool.fetchrow(
         """
@@ -2860,7 +4562,12 @@ async def host(ctx: commands.Context, *args: str):
         message.id,
         giveaway_id,
     )
-    await log_event("admin_command", ctx.author.id, f"!host {prize} {winner_amount} {time_str}")
+    giveaway_scheduler.schedule(giveaway_id, end_timestamp)
+    log_event(
+        "admin_command",
+        ctx.author.id,
+        {"command": "!host", "prize": prize, "winners": winner_amount, "duration": time_str, "giveaway_id": giveaway_id},
+    )
 
 
 @bot.command()
@@ -2883,18 +4590,7 @@ async def bighost(ctx: commands.Context, *args: str):
         return
     end_timestamp = now_ts() + duration
     await send_command_banner(ctx.channel, "giveaway_big")
-    embed = build_embed(
-        "giveaway_big",
-        f"{EMOJI['star']} BIG Giveaway",
-        "Spend entries to enter. Each entry increases your weight.",
-        [
-            ("Prize", prize, False),
-            ("Winners", str(winner_amount), True),
-            ("Ends", f"<t:{end_timestamp}:R>", True),
-        ],
-        include_banner=False,
-    )
-    embed.set_footer(text=f"Hosted by {ctx.author.display_name}")
+    embed = build_giveaway_embed(True, prize, winner_amount, end_timestamp, ctx.author.display_name)
     channel = ctx.channel
     row = await db_pool.fetchrow(
         """
@@ -2917,7 +4613,12 @@ async def bighost(ctx: commands.Context, *args: str):
         message.id,
         giveaway_id,
     )
-    await log_event("admin_command", ctx.author.id, f"!bighost {prize} {winner_amount} {time_str}")
+    giveaway_scheduler.schedule(giveaway_id, end_timestamp)
+    log_event(
+        "admin_command",
+        ctx.author.id,
+        {"command": "!bighost", "prize": prize, "winners": winner_amount, "duration": time_str, "giveaway_id": giveaway_id},
+    )
 
 
 @host.error